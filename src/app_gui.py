@@ -1,14 +1,37 @@
 import argparse
+import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from converter import Converter
 
 try:
     from core import manager
+    from core.archive_io import is_archive
 except ImportError:
     from src.core import manager
+    from src.core.archive_io import is_archive
+
+JOURNAL_NAME = ".convert_journal.jsonl"
+
+
+def worker_count(value: str) -> Union[int, str]:
+    if value == "auto":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected an integer or 'auto'")
+
+
+def print_progress(progress) -> None:
+    sys.stderr.write("\r" + progress.describe().ljust(79))
+    sys.stderr.flush()
+
+
+def _archive_inputs(paths) -> list:
+    return [raw for raw in paths if Path(raw).is_file() and is_archive(raw)]
 
 
 def convert_paths(
@@ -25,10 +48,22 @@ def convert_paths(
     main_only: bool = False,
     timeout: float = 10.0,
     show_optional: bool = False,
-    max_workers: int = 1,
+    max_workers: Union[int, str] = 1,
     drop_unknown_tags: bool = False,
     allowlist_file: Optional[str] = None,
+    show_progress: bool = False,
+    buffer_small_outputs: bool = False,
+    journal: Optional[str] = None,
+    resume: bool = False,
+    file_timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    output_archive: Optional[str] = None,
+    dedupe: bool = False,
+    hardlink_duplicates: bool = False,
+    schedule: str = "listing",
 ):
+    if output_archive and len(_archive_inputs(paths)) > 1:
+        raise ValueError("--output-archive takes a single archive input")
     output_dir_path = Path(output_dir) if output_dir else None
     base_dir_path = Path(base_dir) if base_dir else None
     total_results = []
@@ -45,23 +80,51 @@ def convert_paths(
                 print(f"[skip] No supported files in folder: {path}")
                 continue
 
+            journal_path = None
+            if journal:
+                journal_path = Path(journal)
+            elif resume:
+                journal_path = (output_dir_path or path) / JOURNAL_NAME
             results = manager.batch_convert(
                 files,
                 target_format=target_format,
-                enable_backup=enable_backup,
                 output_dir=output_dir_path,
                 base_dir=path,
                 base_url=base_url,
                 rewrite_paths=rewrite_paths,
                 drop_unknown_tags=drop_unknown_tags,
                 max_workers=max_workers,
+                stats_callback=print_progress if show_progress else None,
+                buffer_small_outputs=buffer_small_outputs,
+                journal_path=journal_path,
+                resume=resume,
+                file_timeout=file_timeout,
+                memory_limit_mb=memory_limit_mb,
+                dedupe=dedupe,
+                hardlink_duplicates=hardlink_duplicates,
+                schedule=schedule,
+            )
+            if show_progress:
+                sys.stderr.write("\n")
+            total_results.extend(results)
+        elif path.is_file() and is_archive(path):
+            results = manager.convert_archive(
+                path,
+                target_format=target_format,
+                output_archive=Path(output_archive) if output_archive else None,
+                output_dir=output_dir_path,
+                base_dir=base_dir_path,
+                base_url=base_url,
+                rewrite_paths=rewrite_paths,
+                drop_unknown_tags=drop_unknown_tags,
+                allowlist_file=allowlist_file,
+                max_workers=max_workers,
             )
             total_results.extend(results)
         elif path.is_file():
             res = manager.convert_file(
                 str(path),
                 target_format=target_format,
-                enable_backup=enable_backup,
                 output_dir=output_dir_path,
                 base_dir=base_dir_path or path.parent,
                 base_url=base_url,
@@ -94,7 +157,7 @@ def convert_paths(
     if export and export.lower() != "none":
         from core.exporter import export_content, ExportError
         for r in total_results:
-            if not r.success or not r.output_path:
+            if not r.success or not r.output_path or "!/" in r.output_path:
                 continue
             out_path = Path(r.output_path)
             try:
@@ -116,14 +179,52 @@ def convert_paths(
     return total_results
 
 
+def convert_jsonl(
+    source: str,
+    destination: Optional[str],
+    target_format: str,
+    max_workers: Union[int, str] = 1,
+    base_url: Optional[str] = None,
+    rewrite_paths: bool = False,
+    drop_unknown_tags: bool = False,
+    allowlist_file: Optional[str] = None,
+) -> int:
+    try:
+        from core.bulk import run_jsonl
+    except ImportError:
+        from src.core.bulk import run_jsonl
+
+    target = "md" if target_format == "auto" else target_format
+    infile = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    outfile = sys.stdout if not destination or destination == "-" else open(destination, "w", encoding="utf-8")
+    try:
+        count, errors = run_jsonl(
+            infile,
+            outfile,
+            target=target,
+            max_workers=max_workers,
+            base_url=base_url,
+            rewrite_paths=rewrite_paths,
+            drop_unknown_tags=drop_unknown_tags,
+            allowlist_file=Path(allowlist_file) if allowlist_file else None,
+        )
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    print(f"Summary: {count - errors} success, {errors} failed", file=sys.stderr)
+    return 0 if not errors else 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="HTML ↔ Markdown Converter CLI",
     )
     parser.add_argument(
         "paths",
-        nargs="+",
-        help="File(s) or folder(s) to convert",
+        nargs="*",
+        help="File(s), folder(s) or zip/tar archive(s) to convert",
     )
     parser.add_argument(
         "--target-format",
@@ -200,9 +301,68 @@ def main() -> int:
     )
     parser.add_argument(
         "--max-workers",
-        type=int,
+        type=worker_count,
         default=1,
-        help="Max worker threads for batch conversion",
+        help="Max worker threads for batch conversion, or 'auto' to tune from measured throughput",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=list(manager.SCHEDULES),
+        default="listing",
+        help="Batch order: input listing or largest files first (keeps workers busy on skewed folders)",
+    )
+    parser.add_argument(
+        "--buffer-small-outputs",
+        action="store_true",
+        help="Queue small outputs in memory and write them in bulk",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        help="Record finished files of folder batches in this JSONL journal",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Skip files already converted according to the journal (default: {JOURNAL_NAME} in the output folder)",
+    )
+
+    parser.add_argument(
+        "--output-archive",
+        type=str,
+        help="Write converted archive members into this zip/tar (default: <name>_converted next to the input, or --output-dir)",
+    )
+    parser.add_argument(
+        "--jsonl",
+        type=str,
+        metavar="FILE",
+        help="Bulk mode: read {\"id\", \"html\"} records from a JSONL file ('-' for stdin) and write {\"id\", \"markdown\"} records",
+    )
+    parser.add_argument(
+        "--jsonl-output",
+        type=str,
+        metavar="FILE",
+        help="Output file for --jsonl (default: stdout)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Convert byte-identical files once and copy the result (not with --rewrite-paths without --base-url)",
+    )
+    parser.add_argument(
+        "--hardlink-duplicates",
+        action="store_true",
+        help="With --dedupe, hardlink duplicate outputs instead of copying",
+    )
+    parser.add_argument(
+        "--file-timeout",
+        type=float,
+        help="Per-file conversion timeout (seconds); runs folder batches in supervised worker processes",
+    )
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=int,
+        help="Per-worker memory limit for supervised conversion (POSIX only)",
     )
 
     args = parser.parse_args()
@@ -210,6 +370,23 @@ def main() -> int:
         from core.feature_flags import get_feature_status
         print(get_feature_status())
         return 0
+    if args.max_workers == "auto":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.jsonl:
+        return convert_jsonl(
+            args.jsonl,
+            args.jsonl_output,
+            target_format=args.target_format,
+            max_workers=args.max_workers,
+            base_url=args.base_url,
+            rewrite_paths=args.rewrite_paths,
+            drop_unknown_tags=args.drop_unknown_tags,
+            allowlist_file=args.allowlist_file,
+        )
+    if not args.paths:
+        parser.error("the following arguments are required: paths")
+    if args.output_archive and len(_archive_inputs(args.paths)) > 1:
+        parser.error("--output-archive takes a single archive input")
     results = convert_paths(
         paths=args.paths,
         target_format=args.target_format,
@@ -227,6 +404,16 @@ def main() -> int:
         max_workers=args.max_workers,
         drop_unknown_tags=args.drop_unknown_tags,
         allowlist_file=args.allowlist_file,
+        show_progress=sys.stderr.isatty(),
+        buffer_small_outputs=args.buffer_small_outputs,
+        journal=args.journal,
+        resume=args.resume,
+        file_timeout=args.file_timeout,
+        memory_limit_mb=args.memory_limit_mb,
+        output_archive=args.output_archive,
+        dedupe=args.dedupe,
+        hardlink_duplicates=args.hardlink_duplicates,
+        schedule=args.schedule,
     )
 
     success = [r for r in results if r.success]
@@ -237,9 +424,22 @@ def main() -> int:
     for r in failed:
         print(f"[fail] {r.file_path}: {r.message}")
 
-    print(f"\nSummary: {len(success)} success, {len(failed)} failed")
+    stats = manager.summarize_results(results)
+    summary = f"\nSummary: {stats['succeeded']} success, {stats['failed']} failed"
+    if stats["duplicates"]:
+        summary += f", {stats['duplicates']} conversions saved by dedupe"
+    print(summary)
+    if stats["duration"]:
+        print(
+            f"Stats: {stats['input_bytes'] / 1048576:.2f} MB in, {stats['output_bytes'] / 1048576:.2f} MB out, "
+            f"p50 {stats['p50'] * 1000:.1f} ms, p99 {stats['p99'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms"
+        )
+    if stats["error_codes"]:
+        print("Errors: " + ", ".join(f"{code} {count}" for code, count in sorted(stats["error_codes"].items())))
     return 0 if not failed else 1
 
 
 if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()
     sys.exit(main())
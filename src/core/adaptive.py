@@ -0,0 +1,74 @@
+import logging
+import os
+import time
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveWorkers:
+    """
+    Hill-climbing worker limit for max_workers="auto".
+    Starts small, measures files/sec and process CPU use over each sample period,
+    and adds workers while throughput keeps improving by at least min_gain. When a
+    step stops helping (or the CPUs are saturated) it falls back to the best limit
+    seen and settles. If throughput later drops well below the settled rate, it
+    shrinks by one worker and probes again.
+    """
+
+    def __init__(
+        self,
+        cap: int,
+        start: int = 2,
+        sample_seconds: float = 2.0,
+        min_gain: float = 0.05,
+    ):
+        self.cap = max(1, cap)
+        self.limit = min(start, self.cap)
+        self.sample_seconds = sample_seconds
+        self.min_gain = min_gain
+        self.settled = False
+        self.history: List[Tuple[int, float, float]] = []  # (limit, files/sec, cpu cores used)
+        self._best_rate = 0.0
+        self._best_limit = self.limit
+        self._cpus = os.cpu_count() or 1
+        self._reset_sample()
+
+    def _reset_sample(self) -> None:
+        self._count = 0
+        self._wall = time.monotonic()
+        self._cpu = time.process_time()
+
+    def record(self, files: int = 1) -> None:
+        """Count finished files and re-evaluate the limit once a sample period has passed."""
+        self._count += files
+        elapsed = time.monotonic() - self._wall
+        if elapsed < self.sample_seconds or self._count < self.limit:
+            return
+        rate = self._count / elapsed
+        cores = (time.process_time() - self._cpu) / elapsed
+        self.history.append((self.limit, rate, cores))
+        self._adjust(rate, cores)
+        self._reset_sample()
+
+    def _adjust(self, rate: float, cores: float) -> None:
+        if self.settled:
+            if rate < self._best_rate * 0.7 and self.limit > 1:
+                self.limit -= 1
+                self.settled = False
+                self._best_rate = rate
+                self._best_limit = self.limit
+                logger.info("auto workers: throughput fell to %.1f files/s, shrinking to %d", rate, self.limit)
+            return
+        if rate > self._best_rate * (1 + self.min_gain):
+            self._best_rate = rate
+            self._best_limit = self.limit
+            if self.limit < self.cap and cores < self._cpus * 0.95:
+                self.limit += 1
+                logger.info("auto workers: %.1f files/s (%.1f cores), growing to %d", rate, cores, self.limit)
+                return
+        self.limit = self._best_limit
+        self.settled = True
+        logger.info(
+            "auto workers: settled on %d workers at %.1f files/s (cap %d)", self.limit, self._best_rate, self.cap
+        )
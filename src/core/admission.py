@@ -0,0 +1,205 @@
+import asyncio
+import json
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from .settings import env_setting
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class AdmissionControl:
+    """
+    Bounds how much conversion work the server accepts.
+    At most max_concurrent requests run at once and at most max_queue wait for
+    a slot. A request that finds the queue full, or waits longer than
+    queue_timeout, is rejected with 503. With rate > 0 each client also gets a
+    token bucket (rate requests/sec, burst), and going over it gives 429.
+    Rejections carry a Retry-After estimate based on recent service times.
+    Single event loop only.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float = 10.0,
+        rate: float = 0.0,
+        burst: int = 0,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = max(1, burst or math.ceil(rate))
+        self.active = 0
+        self.waiting = 0
+        self.rejected: Dict[int, int] = {429: 0, 503: 0}
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._buckets: Dict[str, _Bucket] = {}
+        self._service_time = 1.0  # moving average, seconds
+
+    @classmethod
+    def from_env(cls, pool_size: int) -> "AdmissionControl":
+        """
+        Configure from CONVERTER_MAX_CONCURRENT (default 2 x pool size), CONVERTER_MAX_QUEUE
+        (8 x pool size), CONVERTER_QUEUE_TIMEOUT, CONVERTER_RATE_LIMIT and CONVERTER_RATE_BURST.
+        """
+        return cls(
+            max_concurrent=env_setting("CONVERTER_MAX_CONCURRENT", pool_size * 2),
+            max_queue=env_setting("CONVERTER_MAX_QUEUE", pool_size * 8),
+            queue_timeout=env_setting("CONVERTER_QUEUE_TIMEOUT", 10.0, float),
+            rate=env_setting("CONVERTER_RATE_LIMIT", 0.0, float),
+            burst=env_setting("CONVERTER_RATE_BURST", 0),
+        )
+
+    def retry_after(self) -> int:
+        backlog = (self.waiting + 1) / self.max_concurrent
+        return max(1, math.ceil(backlog * self._service_time))
+
+    def check_rate(self, client: str) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) > 10000:
+                self._prune(now)
+            bucket = self._buckets[client] = _Bucket(float(self.burst), now)
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+        bucket.updated = now
+        if bucket.tokens < 1:
+            self.rejected[429] += 1
+            raise Rejected(429, "Rate limit exceeded", (1 - bucket.tokens) / self.rate)
+        bucket.tokens -= 1
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the start time to pass to release()."""
+        if self._slots.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected[503] += 1
+                raise Rejected(503, "Server busy, conversion queue is full", self.retry_after())
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected[503] += 1
+                raise Rejected(503, "Server busy, timed out waiting in the queue", self.retry_after()) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        self.active += 1
+        return time.monotonic()
+
+    def release(self, started: float) -> None:
+        self.active -= 1
+        self._slots.release()
+        self._service_time = 0.8 * self._service_time + 0.2 * (time.monotonic() - started)
+
+    def _prune(self, now: float) -> None:
+        full = [k for k, b in self._buckets.items() if b.tokens + (now - b.updated) * self.rate >= self.burst]
+        for k in full:
+            del self._buckets[k]
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware for AdmissionControl plus a request body limit.
+    Bodies over max_body bytes get 413, from Content-Length when present,
+    otherwise as soon as a chunked body goes over. Only paths starting with one
+    of `prefixes` take a conversion slot; the slot is held until the response
+    is fully sent, so streamed responses count as running. body_limits maps
+    path prefixes to their own limit in place of max_body (e.g. file uploads).
+    """
+
+    def __init__(
+        self,
+        app,
+        control: AdmissionControl,
+        max_body: int = 0,
+        prefixes: Tuple[str, ...] = (),
+        body_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.app = app
+        self.control = control
+        self.max_body = max_body
+        self.prefixes = tuple(prefixes)
+        self.body_limits = dict(body_limits or {})
+
+    def body_limit(self, path: str) -> int:
+        for prefix, limit in self.body_limits.items():
+            if path.startswith(prefix):
+                return limit
+        return self.max_body
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        max_body = self.body_limit(scope.get("path", ""))
+        if max_body:
+            length = dict(scope.get("headers", [])).get(b"content-length")
+            if length is not None and length.isdigit() and int(length) > max_body:
+                await self._reject(send, Rejected(413, f"Request body exceeds {max_body} bytes"))
+                return
+
+        guarded = scope.get("path", "").startswith(self.prefixes) if self.prefixes else False
+        started = None
+        if guarded:
+            try:
+                client = (scope.get("client") or ("-",))[0]
+                self.control.check_rate(client)
+                started = await self.control.acquire()
+            except Rejected as e:
+                await self._reject(send, e)
+                return
+
+        state = {"received": 0, "too_large": False, "started": False}
+
+        async def limited_receive():
+            message = await receive()
+            if max_body and message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > max_body:
+                    state["too_large"] = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def tracking_send(message):
+            if message["type"] == "http.response.start":
+                state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except Exception:
+            if not (state["too_large"] and not state["started"]):
+                raise
+        finally:
+            if started is not None:
+                self.control.release(started)
+        if state["too_large"] and not state["started"]:
+            await self._reject(send, Rejected(413, f"Request body exceeds {max_body} bytes"))
+
+    async def _reject(self, send, error: Rejected) -> None:
+        headers = [(b"content-type", b"application/json")]
+        if error.retry_after is not None:
+            headers.append((b"retry-after", str(max(1, math.ceil(error.retry_after))).encode("latin-1")))
+        await send({"type": "http.response.start", "status": error.status, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps({"detail": error.detail}).encode("utf-8")})
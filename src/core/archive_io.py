@@ -0,0 +1,145 @@
+import io
+import os
+import posixpath
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from .writer import file_mode
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+_TAR_WRITE_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tbz2": "w:bz2",
+    ".tar.xz": "w:xz",
+    ".txz": "w:xz",
+}
+
+
+def archive_suffix(path) -> Optional[str]:
+    """Return the matching archive suffix ('.zip', '.tar.gz', ...) or None."""
+    name = str(path).lower()
+    for suffix in sorted(ZIP_SUFFIXES + TAR_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return suffix
+    return None
+
+
+def is_archive(path) -> bool:
+    return archive_suffix(path) is not None
+
+
+def safe_member_name(name: str) -> Optional[str]:
+    """Normalise a member path; None for absolute or parent-escaping names."""
+    name = name.replace("\\", "/")
+    if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+        return None
+    norm = posixpath.normpath(name)
+    if norm in (".", "") or norm == ".." or norm.startswith("../"):
+        return None
+    return norm
+
+
+def iter_archive(path: Path) -> Iterator[Tuple[str, bytes]]:
+    """Stream (member name, data) for every regular file in a zip or tar archive."""
+    if archive_suffix(path) in ZIP_SUFFIXES:
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                with zf.open(info) as f:
+                    yield info.filename, f.read()
+        return
+    # stream mode reads members sequentially without seeking
+    with tarfile.open(path, mode="r|*") as tf:
+        for member in tf:
+            if not member.isfile():
+                continue
+            f = tf.extractfile(member)
+            if f is not None:
+                yield member.name, f.read()
+
+
+class ArchiveWriter:
+    """
+    Write members straight into a zip or tar archive (format from the suffix).
+    Members go to a temp file in the target folder that close() moves into place
+    with os.replace, like OutputWriter; discard() drops it instead.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        suffix = archive_suffix(self.path)
+        if suffix is None:
+            raise ValueError(f"Unsupported archive type: {self.path.name}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        self._tmp = Path(tmp)
+        self._file = os.fdopen(fd, "w+b")
+        self._zip = None
+        self._tar = None
+        try:
+            if suffix in ZIP_SUFFIXES:
+                self._zip = zipfile.ZipFile(self._file, "w", compression=zipfile.ZIP_DEFLATED)
+            else:
+                self._tar = tarfile.open(fileobj=self._file, mode=_TAR_WRITE_MODES[suffix])
+        except BaseException:
+            self.discard()
+            raise
+
+    def write(self, name: str, data: bytes) -> None:
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        try:
+            self._finish()
+            os.chmod(self._tmp, file_mode())
+            os.replace(self._tmp, self.path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self) -> None:
+        """Drop the partial archive; the target path is left untouched."""
+        try:
+            self._finish()
+        except Exception:
+            pass
+        try:
+            os.unlink(self._tmp)
+        except OSError:
+            pass
+
+    def _finish(self) -> None:
+        archive, self._zip, self._tar = self._zip or self._tar, None, None
+        try:
+            if archive is not None:
+                archive.close()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from .feature_flags import has_module
+from .settings import env_setting
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    __slots__ = ("browser", "served", "active", "retired")
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.served = 0
+        self.active = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """
+    Long-lived headless Chromium instances for dynamic rendering (playwright).
+    Every render gets its own browser context, so cookies, storage and proxy
+    settings are never shared between requests. At most max_pages renders run
+    at once. A browser that has served recycle_after pages is replaced and
+    closed once its last page finishes, which keeps Chromium's memory from
+    creeping up in a long-running server.
+    """
+
+    def __init__(self, browsers: int = 1, max_pages: int = 4, recycle_after: int = 100, timeout: float = 30.0):
+        self.browsers = max(1, browsers)
+        self.max_pages = max(1, max_pages)
+        self.recycle_after = max(1, recycle_after)
+        self.timeout = timeout
+        self.launched = 0
+        self._playwright = None
+        self._timeout_error = None
+        self._slots: List[_Slot] = []
+        self._retired: List[_Slot] = []  # replaced browsers still finishing pages
+        self._limit = asyncio.Semaphore(self.max_pages)
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_env(cls) -> "BrowserPool":
+        """Configure from CONVERTER_BROWSERS, CONVERTER_BROWSER_PAGES, CONVERTER_BROWSER_RECYCLE and CONVERTER_BROWSER_TIMEOUT."""
+        return cls(
+            browsers=env_setting("CONVERTER_BROWSERS", 1),
+            max_pages=env_setting("CONVERTER_BROWSER_PAGES", 4),
+            recycle_after=env_setting("CONVERTER_BROWSER_RECYCLE", 100),
+            timeout=env_setting("CONVERTER_BROWSER_TIMEOUT", 30.0, float),
+        )
+
+    @staticmethod
+    def available() -> bool:
+        return has_module("playwright")
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._playwright is not None:
+                return
+            from playwright.async_api import TimeoutError as PlaywrightTimeout
+            from playwright.async_api import async_playwright
+
+            playwright = await async_playwright().start()
+            self._playwright = playwright
+            self._timeout_error = PlaywrightTimeout
+            try:
+                for _ in range(self.browsers):
+                    self._slots.append(_Slot(await self._launch()))
+            except Exception:
+                await self.close()
+                raise
+
+    async def render(
+        self, url: str, wait_ms: int = 0, proxy: Optional[str] = None, timeout: Optional[float] = None
+    ) -> str:
+        """
+        Load url in a fresh context and return the rendered HTML.
+        timeout (seconds) defaults to the pool's. Raises TimeoutError on timeout.
+        """
+        timeout = timeout or self.timeout
+        await self.start()
+        async with self._limit:
+            slot = await self._checkout()
+            try:
+                context = await slot.browser.new_context(proxy={"server": proxy} if proxy else None)
+                try:
+                    page = await context.new_page()
+                    await page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
+                    if wait_ms:
+                        await page.wait_for_timeout(wait_ms)
+                    return await page.content()
+                finally:
+                    await context.close()
+            except self._timeout_error as e:
+                raise TimeoutError(f"Rendering {url} timed out after {timeout:g}s") from e
+            finally:
+                await self._checkin(slot)
+
+    async def close(self) -> None:
+        slots, self._slots, self._retired = self._slots + self._retired, [], []
+        for slot in slots:
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self):
+        browser = await self._playwright.chromium.launch(headless=True)
+        self.launched += 1
+        return browser
+
+    async def _checkout(self) -> _Slot:
+        async with self._lock:
+            for i, slot in enumerate(self._slots):
+                if not slot.browser.is_connected():
+                    logger.warning("browser pool: replacing a disconnected browser")
+                    self._retire(slot)
+                    self._slots[i] = _Slot(await self._launch())
+            slot = min(self._slots, key=lambda s: s.active)
+            if slot.served + 1 >= self.recycle_after:
+                # this is its last page; new requests go to the replacement
+                self._slots[self._slots.index(slot)] = _Slot(await self._launch())
+                self._retire(slot)
+            slot.active += 1
+            slot.served += 1
+            return slot
+
+    def _retire(self, slot: _Slot) -> None:
+        slot.retired = True
+        self._retired.append(slot)
+
+    async def _checkin(self, slot: _Slot) -> None:
+        slot.active -= 1
+        if slot.retired and slot.active == 0 and slot in self._retired:
+            self._retired.remove(slot)
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
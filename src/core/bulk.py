@@ -0,0 +1,143 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Tuple, Union
+
+from .manager import convert_content
+
+# target -> (input field, output field)
+RECORD_FIELDS = {
+    "md": ("html", "markdown"),
+    "html": ("markdown", "html"),
+}
+
+
+def convert_record(record: dict, target: str = "md", **options) -> dict:
+    """
+    Convert one {"id": ..., "html": ...} record to {"id": ..., "markdown": ...}
+    (or markdown -> html for target 'html'). Failures become {"id": ..., "error": ...}.
+    """
+    source_field, result_field = RECORD_FIELDS[target]
+    record_id = record.get("id")
+    content = record.get(source_field)
+    if not isinstance(content, str):
+        return {"id": record_id, "error": f"Missing '{source_field}' field"}
+    try:
+        return {"id": record_id, result_field: convert_content(content, target, **options)}
+    except Exception as e:
+        return {"id": record_id, "error": str(e)}
+
+
+# per-item options accepted from API callers
+ITEM_OPTIONS = ("base_url", "rewrite_paths", "drop_unknown_tags")
+# API item type (the source format) -> conversion target
+ITEM_TARGETS = {"html": "md", "md": "html"}
+
+
+def convert_item(item) -> dict:
+    """
+    Convert one API item {"id", "content", "type": 'html'|'md', "options": {...}}
+    to {"id", "result"}; failures become {"id", "error"}.
+    """
+    if not isinstance(item, dict):
+        return {"id": None, "error": "Item is not an object"}
+    item_id = item.get("id")
+    content = item.get("content")
+    target = ITEM_TARGETS.get(item.get("type"))
+    if not isinstance(content, str):
+        return {"id": item_id, "error": "Missing 'content' field"}
+    if target is None:
+        return {"id": item_id, "error": "Invalid type. Use 'html' or 'md'."}
+    options = item.get("options") or {}
+    if not isinstance(options, dict):
+        return {"id": item_id, "error": "'options' must be an object"}
+    options = {k: options[k] for k in ITEM_OPTIONS if k in options}
+    try:
+        return {"id": item_id, "result": convert_content(content, target, **options)}
+    except Exception as e:
+        return {"id": item_id, "error": str(e)}
+
+
+def convert_items(items: List[Union[dict, str]]) -> List[dict]:
+    """Convert a chunk of API items (dicts, or NDJSON lines still to be parsed) in one worker round trip."""
+    out = []
+    for item in items:
+        if isinstance(item, str):
+            try:
+                item = json.loads(item)
+            except ValueError as e:
+                out.append({"id": None, "error": f"Invalid JSON: {e}"})
+                continue
+        out.append(convert_item(item))
+    return out
+
+
+def _convert_lines(lines: List[str], target: str, options: dict) -> List[Tuple[str, bool]]:
+    """Parse, convert and serialise a chunk of JSONL lines (runs in a worker process)."""
+    out = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("record is not an object")
+        except ValueError as e:
+            result = {"id": None, "error": f"Invalid JSON: {e}"}
+        else:
+            result = convert_record(record, target, **options)
+        out.append((json.dumps(result, ensure_ascii=False), "error" in result))
+    return out
+
+
+def iter_bulk(
+    lines: Iterable[str],
+    target: str = "md",
+    max_workers: Union[int, str] = 1,
+    chunk_size: int = 64,
+    **options,
+) -> Iterator[Tuple[str, bool]]:
+    """
+    Convert JSONL lines and yield (output line, failed) in input order.
+    With max_workers > 1, chunks of chunk_size lines are converted in worker
+    processes; at most max_workers * 2 chunks are in flight, which bounds both
+    memory and how far results can run ahead of the output.
+    max_workers="auto" uses one process per CPU.
+    """
+    if max_workers == "auto":
+        max_workers = os.cpu_count() or 1
+    if target not in RECORD_FIELDS:
+        raise ValueError(f"Unsupported target format: {target}")
+    records = (line for line in lines if line.strip())
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    if not max_workers or max_workers <= 1:
+        for chunk in chunks:
+            yield from _convert_lines(chunk, target, options)
+        return
+
+    window = deque()
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        for chunk in chunks:
+            window.append(ex.submit(_convert_lines, chunk, target, options))
+            if len(window) >= max_workers * 2:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+
+
+def run_jsonl(
+    infile: IO[str],
+    outfile: IO[str],
+    target: str = "md",
+    max_workers: Union[int, str] = 1,
+    chunk_size: int = 64,
+    **options,
+) -> Tuple[int, int]:
+    """Stream JSONL from infile to outfile. Returns (records, errors)."""
+    count = errors = 0
+    for line, failed in iter_bulk(infile, target, max_workers=max_workers, chunk_size=chunk_size, **options):
+        outfile.write(line + "\n")
+        count += 1
+        errors += failed
+    outfile.flush()
+    return count, errors
@@ -1,5 +1,7 @@
+import io
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from .md_to_html import markdown_to_html
 from .html_to_md import html_to_markdown
@@ -9,21 +11,18 @@ class ExportError(RuntimeError):
     pass
 
 
-def export_pdf(html_content: str, output_path: Path, css_text: Optional[str] = None) -> Path:
+def _build_pdf(html_content: str, css_text: Optional[str] = None):
     try:
         from fpdf import FPDF, HTMLMixin
     except Exception as e:
         raise ExportError("fpdf2 is required") from e
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
     class PDF(FPDF, HTMLMixin):
         pass
 
     pdf = PDF()
     pdf.add_page()
 
-    import os
     import re
     font_path = os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts', 'msyh.ttc')
     font_path_bd = os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts', 'msyhbd.ttc')
@@ -44,11 +43,22 @@ def export_pdf(html_content: str, output_path: Path, css_text: Optional[str] = N
     html_clean = re.sub(r'<pre[^>]*>(.*?)</pre>', r'<p>\1</p>', html_clean, flags=re.DOTALL)
 
     pdf.write_html(html_clean, font_family=font_family)
+    return pdf
+
+
+def export_pdf(html_content: str, output_path: Path, css_text: Optional[str] = None) -> Path:
+    pdf = _build_pdf(html_content, css_text)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     pdf.output(str(output_path))
     return output_path
 
 
-def export_docx_from_html(html_content: str, output_path: Path) -> Path:
+def export_pdf_bytes(html_content: str, css_text: Optional[str] = None) -> bytes:
+    """Render the PDF in memory (fpdf2 returns the document when no file name is given)."""
+    return bytes(_build_pdf(html_content, css_text).output())
+
+
+def _build_docx(html_content: str):
     try:
         from docx import Document
         from docx.shared import Pt, Inches
@@ -117,12 +127,23 @@ def export_docx_from_html(html_content: str, output_path: Path) -> Path:
 
     for el in soup.find_all(['h1','h2','h3','h4','h5','h6','p','ul','ol','table','pre','blockquote','hr']):
         process_element(el)
+    return doc
+
 
+def export_docx_from_html(html_content: str, output_path: Path) -> Path:
+    doc = _build_docx(html_content)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     doc.save(str(output_path))
     return output_path
 
 
+def export_docx_bytes(html_content: str) -> bytes:
+    """Build the DOCX in memory."""
+    buf = io.BytesIO()
+    _build_docx(html_content).save(buf)
+    return buf.getvalue()
+
+
 def export_content(
     content: str,
     content_type: str,
@@ -134,10 +155,7 @@ def export_content(
     content_type: 'html' or 'md'
     export_format: 'pdf' or 'docx'
     """
-    if content_type == "md":
-        html_content = markdown_to_html(content)
-    else:
-        html_content = content
+    html_content = markdown_to_html(content) if content_type == "md" else content
 
     if export_format == "pdf":
         return export_pdf(html_content, target_path.with_suffix(".pdf"), css_text=css_text)
@@ -145,3 +163,42 @@ def export_content(
         return export_docx_from_html(html_content, target_path.with_suffix(".docx"))
     else:
         raise ExportError(f"Unsupported export format: {export_format}")
+
+
+def export_content_bytes(
+    content: str,
+    content_type: str,
+    export_format: str,
+    css_text: Optional[str] = None,
+) -> bytes:
+    """Like export_content, but returns the document instead of writing a file."""
+    html_content = markdown_to_html(content) if content_type == "md" else content
+
+    if export_format == "pdf":
+        return export_pdf_bytes(html_content, css_text=css_text)
+    elif export_format == "docx":
+        return export_docx_bytes(html_content)
+    else:
+        raise ExportError(f"Unsupported export format: {export_format}")
+
+
+def export_content_spooled(
+    content: str,
+    content_type: str,
+    export_format: str,
+    spill_path: Path,
+    spill_bytes: int,
+    css_text: Optional[str] = None,
+) -> Union[bytes, Path]:
+    """
+    export_content_bytes, except that documents larger than spill_bytes are
+    written to spill_path (and it is returned) so large exports are not held in
+    memory or passed between processes. The caller picks a unique spill_path
+    and deletes it, including when this call fails or its worker is killed.
+    """
+    data = export_content_bytes(content, content_type, export_format, css_text=css_text)
+    if len(data) <= spill_bytes:
+        return data
+    with open(spill_path, "wb") as f:
+        f.write(data)
+    return Path(spill_path)
@@ -1,22 +1,25 @@
-def _check(module_name: str, attr: str = None) -> bool:
-    try:
-        mod = __import__(module_name)
-        if attr:
-            getattr(mod, attr)
-        return True
-    except Exception:
-        return False
+import importlib.util
+from functools import lru_cache
 
-
-OPTIONAL_FEATURES = {
-    "pyqtwebengine": _check("PyQt5.QtWebEngineWidgets"),
-    "weasyprint": _check("weasyprint"),
-    "python_docx": _check("docx"),
-    "playwright": _check("playwright"),
-    "pywin32": _check("win32clipboard"),
-    "readability": _check("readability"),
+# feature name -> module that provides it
+FEATURE_MODULES = {
+    "pyqtwebengine": "PyQt5.QtWebEngineWidgets",
+    "weasyprint": "weasyprint",
+    "python_docx": "docx",
+    "playwright": "playwright",
+    "pywin32": "win32clipboard",
+    "readability": "readability",
 }
 
 
+@lru_cache(maxsize=None)
+def has_module(module_name: str) -> bool:
+    """Whether a module is installed, found without importing it (parent packages of dotted names are imported)."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 def get_feature_status():
-    return OPTIONAL_FEATURES.copy()
+    return {name: has_module(module) for name, module in FEATURE_MODULES.items()}
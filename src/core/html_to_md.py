@@ -199,13 +199,11 @@ class HTMLToMarkdownParser(HTMLParser):
             self.text.append(data)
 
     def get_markdown(self) -> str:
-        md = ''.join(self.text)
-        # 多个换行合并为��个
-        md = re.sub(r'\n{3,}', '\n\n', md)
-        md = re.sub(r'\[\]\(url\)', '', md)
-        md = re.sub(r'(?<!!)\[\]', '', md)  # 删除空链接，但保留图片语法 ![]
-        md = re.sub(r'^([^\n#]+)\n(# \1)', r'\2', md)
-        return md.strip()
+        return _postprocess(''.join(self.text)).strip()
+
+    def at_block_boundary(self) -> bool:
+        """True when no list, table, link or code element is open."""
+        return not (self.list_stack or self.link_stack or self.in_table or self.in_pre or self.in_code)
 
     def _flush_table(self) -> None:
         if not self.table_rows:
@@ -259,6 +257,160 @@ class HTMLToMarkdownParser(HTMLParser):
         table_md = '\n'.join(lines)
         self.text.append('\n' + table_md + '\n')
 
+def _preprocess(html: str) -> str:
+    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL)
+    html = re.sub(r'<div[^>]*>', '', html)  # 开始标签移除
+    html = re.sub(r'(</div>)+', '\n', html)  # 连续结束标签只产生一个换行
+    html = re.sub(r'\s*style="[^"]*"', '', html)
+    html = re.sub(r'<span[^>]*>', '', html)
+    html = re.sub(r'</span>', '', html)
+    return unescape(html)
+
+
+def _postprocess(md: str, at_start: bool = True) -> str:
+    # at_start=False: md continues a document, so the heading rule (anchored at its start) does not apply
+    # 多个换行合并为��个
+    md = re.sub(r'\n{3,}', '\n\n', md)
+    md = re.sub(r'\[\]\(url\)', '', md)
+    md = re.sub(r'(?<!!)\[\]', '', md)  # 删除空链接，但保留图片语法 ![]
+    if at_start:
+        md = re.sub(r'^([^\n#]+)\n(# \1)', r'\2', md)
+    return md
+
+
+# _preprocess drops these, so the text on either side of them joins into one run
+_JOINING_TAGS = {'div', 'span', 'style'}
+_TAG_START = re.compile(r'</?([a-zA-Z][^\s/>]*)')
+
+
+def _tag_end(buf: str, pos: int) -> int:
+    """Index of the '>' closing the tag whose attributes start at pos, skipping quoted values."""
+    quote = None
+    for i in range(pos, len(buf)):
+        c = buf[i]
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif c == '>':
+            return i
+    return -1
+
+
+def _html_cut(buf: str) -> int:
+    """
+    Length of the prefix of buf that can be converted on its own. It ends right
+    after a tag that _preprocess keeps, outside <style>/<script> and quoted
+    attribute values, so the parser sees the same text runs as it would for the
+    whole document (whitespace-only runs are dropped, others are kept).
+    """
+    end = len(buf)
+    while True:
+        end = buf.rfind('>', 0, end)
+        if end < 0:
+            return 0
+        for raw in ('style', 'script'):
+            opened = buf.rfind('<' + raw, 0, end)
+            if opened >= 0 and buf.find('</' + raw, opened, end + 1) < 0:
+                end = opened
+                break
+        else:
+            start = buf.rfind('<', 0, end)
+            if start < 0:
+                return 0  # a '>' in text before any tag
+            tag = _TAG_START.match(buf, start)
+            if tag is None or tag.group(1).lower() in _JOINING_TAGS or buf.count('"', start, end) % 2:
+                end = start
+                continue
+            if _tag_end(buf, tag.end()) != end:
+                continue  # this '>' is text after the tag; try the one before it
+            return end + 1
+        if end < 0:
+            return 0
+
+
+class HTMLToMarkdownStream:
+    """
+    Incremental html_to_markdown: feed() HTML in chunks of any size and get back
+    the Markdown that is complete so far, then close() for the rest. Output is
+    released only at top-level block boundaries, so the pieces join up to the
+    same text html_to_markdown gives for the whole document.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        base_path: Optional[Path] = None,
+        rewrite_paths: bool = False,
+        drop_unknown_tags: bool = False,
+        allow_inline=DEFAULT_ALLOWED_INLINE,
+        allow_block=DEFAULT_ALLOWED_BLOCK,
+        allowlist_file: Optional[Path] = None,
+    ):
+        if allowlist_file:
+            try:
+                allow_inline, allow_block = load_allowlist(allowlist_file)
+            except Exception:
+                pass
+        self.parser = HTMLToMarkdownParser(
+            base_url=base_url,
+            base_path=base_path,
+            rewrite_paths=rewrite_paths,
+            drop_unknown_tags=drop_unknown_tags,
+            allow_inline=allow_inline,
+            allow_block=allow_block,
+        )
+        self._pending = ''
+        self._started = False
+        self._flushed = False
+        self._emitted = False
+        self._gap = ''
+
+    def feed(self, chunk: str) -> str:
+        self._pending += chunk
+        cut = _html_cut(self._pending)
+        if not cut:
+            return ''
+        self.parser.feed(_preprocess(self._pending[:cut]))
+        self._pending = self._pending[cut:]
+        if not self.parser.at_block_boundary():
+            return ''
+        # hold back the last line and the whitespace before it; the clean-up
+        # regexes look across those, the heading one at the first two lines, and
+        # a document's trailing whitespace is stripped
+        md = ''.join(self.parser.text)
+        end = md.rstrip('\n').rfind('\n')
+        while end > 0 and md[end - 1].isspace():
+            end -= 1
+        if end <= 0 or (not self._flushed and md.find('\n', 0, end) < 0):
+            return ''
+        self.parser.text = [md[end:]]
+        self._flushed = True
+        return self._emit(md[:end])
+
+    def close(self) -> str:
+        # no parser.close(): html_to_markdown drops an unfinished trailing tag too
+        self.parser.feed(_preprocess(self._pending))
+        self._pending = ''
+        return self._emit(''.join(self.parser.text))
+
+    def _emit(self, md: str) -> str:
+        md = _postprocess(md, at_start=not self._emitted)
+        self._emitted = True
+        if not self._started:
+            md = md.lstrip()
+            self._started = bool(md)
+        # trailing whitespace waits for more text; at the end of the document it is stripped
+        body = md.rstrip()
+        if not body:
+            self._gap += md
+            return ''
+        out = self._gap + body
+        self._gap = md[len(body):]
+        return out
+
+
 def html_to_markdown(
     html_content: str,
     base_url: Optional[str] = None,
@@ -275,14 +427,7 @@ def html_to_markdown(
             allow_inline, allow_block = load_allowlist(allowlist_file)
         except Exception:
             pass
-    # Pre-processing
-    html = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL)
-    html = re.sub(r'<div[^>]*>', '', html)  # 开始标签移除
-    html = re.sub(r'(</div>)+', '\n', html)  # 连续结束标签只产生一个换行
-    html = re.sub(r'\s*style="[^"]*"', '', html)
-    html = re.sub(r'<span[^>]*>', '', html)
-    html = re.sub(r'</span>', '', html)
-    html = unescape(html)
+    html = _preprocess(html_content)
 
     parser = HTMLToMarkdownParser(
         base_url=base_url,
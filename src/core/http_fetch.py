@@ -0,0 +1,143 @@
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from .settings import env_setting
+
+
+class FetchError(RuntimeError):
+    """The remote host answered with an error status or the connection failed."""
+
+
+class _HostLimit:
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, per_host: int):
+        self.semaphore = asyncio.Semaphore(per_host)
+        self.users = 0
+
+
+class AsyncFetcher:
+    """
+    Shared HTTP client for the async API.
+    Connections are pooled and kept alive across requests (one client per proxy),
+    at most per_host requests run against the same host at once, and timeouts
+    raise TimeoutError. A host's limit is dropped once no fetch uses it, so the
+    table stays as small as the set of hosts in flight. Uses httpx.AsyncClient when installed; otherwise a pooled
+    requests.Session on worker threads, so fetches still overlap.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        per_host: int = 6,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+    ):
+        self.max_connections = max_connections
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._clients: Dict[Optional[str], object] = {}
+        self._hosts: Dict[str, _HostLimit] = {}
+        self._httpx = None
+        self._backend_checked = False
+
+    def _load_backend(self) -> None:
+        # imported on first fetch, not at server start
+        if self._backend_checked:
+            return
+        try:
+            import httpx  # Optional dependency
+        except ImportError:
+            httpx = None
+        self._httpx = httpx
+        self._backend_checked = True
+
+    @classmethod
+    def from_env(cls) -> "AsyncFetcher":
+        """Configure from CONVERTER_FETCH_MAX_CONNECTIONS, CONVERTER_FETCH_PER_HOST, CONVERTER_FETCH_TIMEOUT and CONVERTER_FETCH_CONNECT_TIMEOUT."""
+        return cls(
+            max_connections=env_setting("CONVERTER_FETCH_MAX_CONNECTIONS", 100),
+            per_host=env_setting("CONVERTER_FETCH_PER_HOST", 6),
+            timeout=env_setting("CONVERTER_FETCH_TIMEOUT", 10.0, float),
+            connect_timeout=env_setting("CONVERTER_FETCH_CONNECT_TIMEOUT", 5.0, float),
+        )
+
+    async def fetch_text(self, url: str, timeout: Optional[float] = None, proxy: Optional[str] = None) -> str:
+        """GET url and return the decoded body."""
+        host = urlsplit(url).netloc.lower()
+        if not host:
+            raise ValueError(f"Not an absolute URL: {url}")
+        timeout = timeout or self.timeout
+        self._load_backend()
+        client = self._client(proxy)
+        limit = self._hosts.get(host)
+        if limit is None:
+            limit = self._hosts[host] = _HostLimit(self.per_host)
+        limit.users += 1
+        try:
+            async with limit.semaphore:
+                if self._httpx is not None:
+                    return await self._fetch_httpx(client, url, timeout)
+                return await asyncio.to_thread(self._fetch_requests, client, url, timeout)
+        finally:
+            limit.users -= 1
+            if limit.users == 0:
+                del self._hosts[host]
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            if self._httpx is not None:
+                await client.aclose()
+            else:
+                client.close()
+
+    def _client(self, proxy: Optional[str]):
+        client = self._clients.get(proxy)
+        if client is not None:
+            return client
+        if self._httpx is not None:
+            httpx = self._httpx
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                follow_redirects=True,
+                proxy=proxy,
+            )
+        else:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.per_host)
+            client.mount("http://", adapter)
+            client.mount("https://", adapter)
+            if proxy:
+                client.proxies = {"http": proxy, "https": proxy}
+        self._clients[proxy] = client
+        return client
+
+    async def _fetch_httpx(self, client, url: str, timeout: float) -> str:
+        httpx = self._httpx
+        try:
+            resp = await client.get(url, timeout=httpx.Timeout(timeout, connect=self.connect_timeout))
+            resp.raise_for_status()
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f"Fetching {url} timed out after {timeout:g}s") from e
+        except httpx.HTTPError as e:
+            raise FetchError(str(e)) from e
+        return resp.text
+
+    def _fetch_requests(self, client, url: str, timeout: float) -> str:
+        import requests
+
+        try:
+            resp = client.get(url, timeout=(self.connect_timeout, timeout))
+            resp.raise_for_status()
+        except requests.Timeout as e:
+            raise TimeoutError(f"Fetching {url} timed out after {timeout:g}s") from e
+        except requests.RequestException as e:
+            raise FetchError(str(e)) from e
+        return resp.text
@@ -0,0 +1,205 @@
+import multiprocessing
+import queue
+import threading
+from typing import List, Optional
+
+# manager imports this module, so convert_file/conversion_result are imported lazily
+
+_START_TIMEOUT = 60.0
+
+
+def _child_main(conn, memory_limit_mb: Optional[int]) -> None:
+    if memory_limit_mb:
+        try:
+            import resource
+
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            pass  # not enforceable on this platform
+    from .manager import convert_file
+    from .writer import OutputWriter
+
+    writer = OutputWriter()
+    conn.send("ready")
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, calls, kwargs = task
+        for args in calls:
+            if fn is None:
+                conn.send(convert_file(*args, writer=writer, **kwargs))
+                continue
+            try:
+                reply = (True, fn(*args, **kwargs))
+            except Exception as e:
+                reply = (False, e)
+            try:
+                conn.send(reply)
+            except Exception as e:  # unpicklable result or exception
+                conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, ctx, memory_limit_mb: Optional[int]):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_child_main, args=(child_conn, memory_limit_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        if not self.conn.poll(_START_TIMEOUT):
+            self.kill()
+            raise RuntimeError("Worker process did not start")
+        self.conn.recv()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+            self.process.join(1.0)
+        except (OSError, EOFError):
+            pass
+        self.kill()
+
+
+class IsolatedRunner:
+    """
+    Runs convert_file (or any picklable function, via call()) in supervised
+    worker processes.
+    A worker that exceeds the per-file timeout is killed and replaced, as is one
+    that dies or runs out of memory (memory_limit_mb, POSIX only); the file is
+    reported as a failed conversion_result with error_code 'timeout', 'memory'
+    or 'crashed' and the rest of the batch keeps going.
+    Thread-safe: each calling thread checks out its own worker process.
+    """
+
+    def __init__(self, size: int = 1, timeout: Optional[float] = None, memory_limit_mb: Optional[int] = None):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def run(self, file_path: str, **kwargs):
+        return self.run_many([file_path], **kwargs)[0]
+
+    def run_many(self, file_paths: List[str], **kwargs) -> list:
+        """
+        Convert a chunk of files in one worker round trip; the timeout applies per file.
+        If the worker has to be killed, the rest of the chunk is retried on a fresh one.
+        """
+        from .manager import conversion_result
+
+        worker = self._acquire()
+        worker.conn.send((None, [(p,) for p in file_paths], kwargs))
+        results = []
+        for file_path in file_paths:
+            try:
+                if worker.conn.poll(self.timeout):
+                    res = worker.conn.recv()
+                    results.append(res)
+                    if res.error_code != "memory":
+                        continue
+                else:
+                    results.append(conversion_result(
+                        False, f"Timed out after {self.timeout:g}s", file_path, error_code="timeout"
+                    ))
+            except (EOFError, OSError):
+                worker.process.join(1.0)
+                results.append(conversion_result(
+                    False, f"Worker process died (exit code {worker.process.exitcode})", file_path, error_code="crashed"
+                ))
+            self._discard(worker)
+            rest = file_paths[len(results):]
+            if rest:
+                results.extend(self.run_many(rest, **kwargs))
+            return results
+        self._idle.put(worker)
+        return results
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) in a worker process and return its result.
+        Exceptions raised by fn are re-raised here. Raises TimeoutError when the
+        call exceeds the timeout and RuntimeError when the worker dies; either
+        way the worker is killed and replaced.
+        """
+        return self.call_within(self.timeout, fn, *args, **kwargs)
+
+    def call_within(self, timeout: Optional[float], fn, *args, **kwargs):
+        """call() with its own timeout (None waits indefinitely)."""
+        worker = self._acquire()
+        try:
+            worker.conn.send((fn, [args], kwargs))
+        except Exception:
+            self._idle.put(worker)  # pickling failed before anything was sent
+            raise
+        try:
+            finished = worker.conn.poll(timeout)
+            if finished:
+                ok, value = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(1.0)
+            exitcode = worker.process.exitcode
+            self._discard(worker)
+            raise RuntimeError(f"Worker process died (exit code {exitcode})") from None
+        if not finished:
+            self._discard(worker)
+            raise TimeoutError(f"Timed out after {timeout:g}s")
+        if not ok and isinstance(value, MemoryError):
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+        if not ok:
+            raise value
+        return value
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def __enter__(self) -> "IsolatedRunner":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _acquire(self) -> _Worker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            spawn = self._started < self.size
+            if spawn:
+                self._started += 1
+        if not spawn:
+            return self._idle.get()
+        try:
+            return _Worker(self._ctx, self.memory_limit_mb)
+        except Exception:
+            with self._lock:
+                self._started -= 1
+            raise
+
+    def _discard(self, worker: _Worker) -> None:
+        """Kill a worker and start its replacement so waiting threads are not starved."""
+        worker.kill()
+        try:
+            self._idle.put(_Worker(self._ctx, self.memory_limit_mb))
+        except Exception:
+            with self._lock:
+                self._started -= 1
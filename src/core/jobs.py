@@ -0,0 +1,166 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+from .manager import BatchControl, batch_convert, conversion_result, summarize_results
+from .progress import BatchProgress
+
+JOB_FINISHED = ("done", "cancelled", "failed")
+
+
+def result_entry(index: int, res: conversion_result) -> dict:
+    return {
+        "index": index,
+        "file": res.file_path,
+        "success": res.success,
+        "message": res.message,
+        "output_path": str(res.output_path) if res.output_path else None,
+        "error_code": res.error_code,
+    }
+
+
+class BatchJob:
+    """One queued batch_convert run and what the API reports about it."""
+
+    def __init__(self, files: List[str], options: dict):
+        self.id = uuid.uuid4().hex
+        self.files = files
+        self.options = options
+        self.status = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        self.summary: Optional[dict] = None
+        self.control = BatchControl()
+        self.progress: Optional[BatchProgress] = None
+        # (index, result) in completion order; only ever appended to
+        self.results: List[Tuple[int, conversion_result]] = []
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in JOB_FINISHED
+
+    def describe(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": len(self.files),
+            "completed": len(self.results),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+            "summary": self.summary,
+        }
+
+    def describe_progress(self) -> dict:
+        p = self.progress
+        if p is None:
+            return {"status": self.status, "completed": 0, "total": len(self.files), "percent": 0}
+        return {
+            "status": self.status,
+            "completed": p.completed,
+            "total": p.total,
+            "failed": p.failed,
+            "percent": p.percent,
+            "files_per_sec": round(p.files_per_sec, 2),
+            "mb_per_sec": round(p.mb_per_sec, 3),
+            "eta": p.eta,
+            "current": p.current,
+        }
+
+
+class JobQueue:
+    """
+    In-process queue of batch jobs for the API.
+    Up to `concurrency` jobs run at once on background threads, each through
+    batch_convert (max_workers per job) with its own pause/cancel control.
+    Finished jobs are kept for `retention` seconds, and at most `max_jobs` are
+    remembered, so clients have time to collect their results.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        retention: float = 3600.0,
+        max_jobs: int = 1000,
+        max_workers: Union[int, str] = "auto",
+    ):
+        self.concurrency = max(1, concurrency)
+        self.retention = retention
+        self.max_jobs = max_jobs
+        self.max_workers = max_workers
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="batch-job")
+
+    def submit(self, files: List[str], **options) -> BatchJob:
+        """Queue batch_convert(files, **options); returns immediately."""
+        job = BatchJob(files, options)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[BatchJob]:
+        """Cancel a queued or running job; files already in flight still finish."""
+        job = self.get(job_id)
+        if job is not None and not job.is_finished:
+            job.control.cancel()
+        return job
+
+    def active(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.is_finished)
+
+    def close(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.control.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: BatchJob) -> None:
+        if job.control.cancelled:
+            job.finished = time.time()
+            job.status = "cancelled"
+            return
+        job.status = "running"
+        job.started = time.time()
+
+        def record(progress: BatchProgress) -> None:
+            job.progress = progress
+
+        try:
+            results = batch_convert(
+                job.files,
+                max_workers=self.max_workers,
+                control=job.control,
+                stats_callback=record,
+                result_callback=lambda i, res: job.results.append((i, res)),
+                **job.options,
+            )
+            job.summary = summarize_results(r for r in results if r.error_code != "cancelled")
+            status = "cancelled" if job.control.cancelled else "done"
+        except Exception as e:
+            job.error = str(e)
+            status = "failed"
+        # finished is set first: readers treat the status as the commit point
+        job.finished = time.time()
+        job.status = status
+
+    def _prune(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.is_finished and (now - job.finished > self.retention or len(self._jobs) > self.max_jobs):
+                del self._jobs[job_id]
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class BatchJournal:
+    """
+    Append-only JSONL journal of finished batch files.
+    Lines are buffered and synced to disk in groups (every sync_every records
+    or sync_interval seconds) so journaling never becomes the bottleneck.
+    A torn last line from a crash is ignored when the journal is loaded.
+    """
+
+    def __init__(self, path: Path, sync_every: int = 100, sync_interval: float = 2.0):
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._buffer: List[str] = []
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._fh = None
+
+    def load(self) -> Dict[str, dict]:
+        """Latest record per source file, keyed by absolute path."""
+        entries: Dict[str, dict] = {}
+        if not self.path.exists():
+            return entries
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    entries[record["file"]] = record
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return entries
+
+    def is_done(self, record: Optional[dict], file_path: str) -> bool:
+        """True if the record is a success for the unchanged source and its output still exists."""
+        if not record or not record.get("success"):
+            return False
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        if record.get("size") != st.st_size or record.get("mtime_ns") != st.st_mtime_ns:
+            return False
+        output_path = record.get("output_path")
+        return bool(output_path) and os.path.exists(output_path)
+
+    def record(self, file_path: str, success: bool, message: str, output_path: Optional[str] = None) -> None:
+        try:
+            st = os.stat(file_path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size, mtime_ns = None, None
+        line = json.dumps(
+            {
+                "file": os.path.abspath(file_path),
+                "success": success,
+                "message": message,
+                "output_path": output_path,
+                "size": size,
+                "mtime_ns": mtime_ns,
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._buffer.append(line)
+            due = len(self._buffer) >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval
+        if due:
+            self.sync()
+
+    def sync(self) -> None:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._last_sync = time.monotonic()
+            if not lines:
+                return
+            if self._fh is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8")
+                if self._fh.tell() and not self._ends_with_newline():
+                    self._fh.write("\n")
+            self._fh.write("\n".join(lines) + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self) -> None:
+        self.sync()
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "BatchJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,86 @@
+import html
+from typing import List, Optional
+
+from .md_to_html import MuyaRenderer, split_blocks
+
+
+class StaleVersion(ValueError):
+    pass
+
+
+class LiveSession:
+    """
+    One live Markdown -> HTML preview, kept per editor connection.
+    The document is held as the blocks from split_blocks, each with its HTML.
+    apply() takes edits against the current version, re-splits the text and
+    renders only the blocks whose source changed (blocks that merely moved are
+    reused). The result is a single splice patch over the block list, and
+    html() equals markdown_to_html(text) with the exceptions listed for
+    MarkdownToHTMLStream.
+    Offsets are code-point indices into the text as left by the previous change.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, rewrite_paths: bool = False, max_chars: int = 5_000_000):
+        self.renderer = MuyaRenderer(base_url=base_url, rewrite_paths=rewrite_paths)
+        self.max_chars = max_chars
+        self.text = ""
+        self.version = 0
+        self.sources: List[str] = []
+        self.blocks: List[str] = []
+        self.rendered = 0
+
+    def reset(self, content: str) -> dict:
+        return self._update(content)
+
+    def apply(self, changes: list, version: int) -> dict:
+        """Apply [{"from", "to", "insert"}, ...] made against `version`; returns the patch."""
+        if version != self.version:
+            raise StaleVersion(f"Edit is against version {version}, document is at {self.version}")
+        if not isinstance(changes, list):
+            raise ValueError("changes must be a list")
+        text = self.text
+        for change in changes:
+            start = int(change["from"])
+            end = int(change.get("to", start))
+            if not 0 <= start <= end <= len(text):
+                raise ValueError(f"Change {start}..{end} is outside the document (length {len(text)})")
+            text = text[:start] + str(change.get("insert", "")) + text[end:]
+        return self._update(text)
+
+    def html(self) -> str:
+        return "\n".join(block for block in self.blocks if block)
+
+    def _update(self, text: str) -> dict:
+        if len(text) > self.max_chars:
+            raise ValueError(f"Document exceeds {self.max_chars} characters")
+        sources = split_blocks(text)
+        old = self.sources
+        limit = min(len(old), len(sources))
+        head = 0
+        while head < limit and old[head] == sources[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[-1 - tail] == sources[-1 - tail]:
+            tail += 1
+
+        reuse = dict(zip(old[head:len(old) - tail], self.blocks[head:len(old) - tail]))
+        inserted = []
+        for source in sources[head:len(sources) - tail]:
+            block = reuse.get(source)
+            if block is None:
+                block = self._render(source)
+                self.rendered += 1
+            inserted.append(block)
+
+        deleted = len(old) - tail - head
+        self.blocks[head:len(old) - tail] = inserted
+        self.sources = sources
+        self.text = text
+        self.version += 1
+        return {"type": "patch", "version": self.version, "start": head, "delete": deleted, "blocks": inserted}
+
+    def _render(self, source: str) -> str:
+        try:
+            return self.renderer.render(source)
+        except Exception:
+            return f"<p>{html.escape(source)}</p>"
@@ -1,32 +1,215 @@
+import hashlib
 import os
+import posixpath
+import re
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Callable, Optional
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 from .html_to_md import html_to_markdown
 from .md_to_html import markdown_to_html
+from .adaptive import AdaptiveWorkers
+from .archive_io import ArchiveWriter, archive_suffix, iter_archive, safe_member_name
+from .isolation import IsolatedRunner
+from .journal import BatchJournal
+from .progress import BatchProgress
+from .writer import OutputWriter
 
 __all__ = [
     "html_to_markdown",
     "markdown_to_html",
+    "convert_content",
     "convert_file",
     "batch_convert",
+    "convert_archive",
     "conversion_result",
+    "summarize_results",
+    "BatchControl",
+    "BatchProgress",
+    "OutputWriter",
+    "BatchJournal",
+    "IsolatedRunner",
+    "SCHEDULES",
+    "AdaptiveWorkers",
 ]
 
 
 class conversion_result:
+    """
+    Outcome of one conversion. Uses __slots__ so large batches stay small in memory.
+    error_code is a short machine-readable reason for failures, e.g. 'not_found',
+    'unsupported', 'decode', 'timeout', 'memory', 'crashed', 'write', 'error'.
+    """
+
+    __slots__ = (
+        "success",
+        "message",
+        "file_path",
+        "output_path",
+        "output_bytes",
+        "error_code",
+        "duplicate_of",
+        "input_bytes",
+        "duration",
+        "encoding",
+    )
+
     def __init__(
         self,
         success: bool,
         message: str,
         file_path: str,
         output_path: Optional[str] = None,
+        output_bytes: int = 0,
+        error_code: Optional[str] = None,
+        duplicate_of: Optional[str] = None,
+        input_bytes: int = 0,
+        duration: float = 0.0,
+        encoding: Optional[str] = None,
     ):
         self.success = success
         self.message = message
         self.file_path = file_path
         self.output_path = output_path
+        self.output_bytes = output_bytes
+        self.error_code = error_code
+        self.duplicate_of = duplicate_of
+        self.input_bytes = input_bytes
+        self.duration = duration
+        self.encoding = encoding
+
+    def __repr__(self) -> str:
+        state = "ok" if self.success else f"failed:{self.error_code or 'error'}"
+        return f"<conversion_result {state} {self.file_path}>"
+
+
+def summarize_results(results: Iterable[conversion_result]) -> dict:
+    """
+    Aggregate totals and duration percentiles (seconds) over a batch.
+    Durations are kept in a compact float array, not per-result objects.
+    """
+    durations = array("d")
+    summary = {
+        "total": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "duplicates": 0,
+        "input_bytes": 0,
+        "output_bytes": 0,
+        "duration": 0.0,
+        "error_codes": {},
+    }
+    for r in results:
+        summary["total"] += 1
+        if r.success:
+            summary["succeeded"] += 1
+        else:
+            summary["failed"] += 1
+            code = r.error_code or "error"
+            summary["error_codes"][code] = summary["error_codes"].get(code, 0) + 1
+        if r.duplicate_of:
+            summary["duplicates"] += 1
+        summary["input_bytes"] += r.input_bytes
+        summary["output_bytes"] += r.output_bytes
+        summary["duration"] += r.duration
+        if r.duration:
+            durations.append(r.duration)
+    ordered = sorted(durations)
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0)):
+        summary[name] = ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+    return summary
+
+
+class BatchControl:
+    """
+    Shared pause/cancel state for batch_convert.
+    Dispatch blocks on an event while paused; cancel wakes any waiter.
+    Legacy pause/cancel callbacks are still honoured and re-checked every poll_interval.
+    """
+
+    def __init__(
+        self,
+        cancel_callback: Optional[Callable[[], bool]] = None,
+        pause_callback: Optional[Callable[[], bool]] = None,
+        poll_interval: float = 0.1,
+    ):
+        self._cancel_callback = cancel_callback
+        self._pause_callback = pause_callback
+        self.poll_interval = poll_interval
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._cancelled = threading.Event()
+
+    def pause(self) -> None:
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        self._resumed.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancelled.is_set() and self._cancel_callback and self._cancel_callback():
+            self.cancel()
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        if not self._resumed.is_set():
+            return True
+        return bool(self._pause_callback and self._pause_callback())
+
+    def wait_until_resumed(self) -> bool:
+        """Block while paused. Returns False if the batch was cancelled."""
+        while self.paused and not self.cancelled:
+            if self._pause_callback:
+                self._cancelled.wait(self.poll_interval)
+            else:
+                self._resumed.wait()
+        return not self.cancelled
+
+
+TARGET_SUFFIXES = {"md": ".md", "html": ".html"}
+
+
+def resolve_target(target_format: str, suffix: str) -> Optional[str]:
+    """Map 'auto' to 'md'/'html' from the source suffix. None if unsupported."""
+    if target_format == "auto":
+        return {".html": "md", ".md": "html"}.get(suffix.lower())
+    return target_format if target_format in TARGET_SUFFIXES else None
+
+
+def convert_content(
+    content: str,
+    target: str,
+    base_url: Optional[str] = None,
+    base_path: Optional[Path] = None,
+    rewrite_paths: bool = False,
+    drop_unknown_tags: bool = False,
+    allowlist_file: Optional[Path] = None,
+) -> str:
+    """Convert an in-memory document. target: 'md' (from HTML) or 'html' (from Markdown)."""
+    if target == "md":
+        return html_to_markdown(
+            content,
+            base_url=base_url,
+            base_path=base_path,
+            rewrite_paths=rewrite_paths,
+            drop_unknown_tags=drop_unknown_tags,
+            allowlist_file=allowlist_file,
+        )
+    return markdown_to_html(
+        content,
+        base_url=base_url,
+        base_path=base_path,
+        rewrite_paths=rewrite_paths,
+    )
 
 
 def convert_file(
@@ -38,75 +221,124 @@ def convert_file(
     rewrite_paths: bool = False,
     drop_unknown_tags: bool = False,
     allowlist_file: Optional[Path] = None,
+    writer: Optional[OutputWriter] = None,
 ) -> conversion_result:
     """
     Convert a single file to target format.
     target_format: 'md', 'html', or 'auto' (detects from extension)
+    writer: shared OutputWriter; a private one is used when omitted.
     """
     path = Path(file_path)
     if not path.exists():
-        return conversion_result(False, "File not found", file_path)
+        return conversion_result(False, "File not found", file_path, error_code="not_found")
+
+    started = time.perf_counter()
+    input_bytes = 0
+    encoding = None
+
+    def failed(message: str, error_code: str) -> conversion_result:
+        return conversion_result(
+            False,
+            message,
+            file_path,
+            error_code=error_code,
+            input_bytes=input_bytes,
+            duration=time.perf_counter() - started,
+            encoding=encoding,
+        )
 
     try:
-        content = path.read_text(encoding="utf-8")
-        result_content = ""
-        output_path: Path
-
-        # Auto-detect target format
-        final_target = target_format
-        if final_target == "auto":
-            suffix = path.suffix.lower()
-            if suffix == ".html":
-                final_target = "md"
-            elif suffix == ".md":
-                final_target = "html"
-            else:
-                return conversion_result(
-                    False, f"Cannot auto-detect target for: {suffix}", file_path
-                )
+        final_target = resolve_target(target_format, path.suffix)
+        if final_target is None:
+            if target_format == "auto":
+                return failed(f"Cannot auto-detect target for: {path.suffix.lower()}", "unsupported")
+            return failed(f"Unsupported target format: {target_format}", "unsupported")
 
-        if final_target == "md":
-            base_path = base_dir or path.parent
-            result_content = html_to_markdown(
-                content,
-                base_url=base_url,
-                base_path=base_path,
-                rewrite_paths=rewrite_paths,
-                drop_unknown_tags=drop_unknown_tags,
-                allowlist_file=allowlist_file,
-            )
-            output_path = path.with_suffix(".md")
-        elif final_target == "html":
-            base_path = base_dir or path.parent
-            result_content = markdown_to_html(
-                content,
-                base_url=base_url,
-                base_path=base_path,
-                rewrite_paths=rewrite_paths,
-            )
-            output_path = path.with_suffix(".html")
-        else:
-            return conversion_result(
-                False, f"Unsupported target format: {target_format}", file_path
-            )
+        data = path.read_bytes()
+        input_bytes = len(data)
+        try:
+            content, encoding = decode_source(data)
+        except UnicodeDecodeError as e:
+            return failed(str(e), "decode")
 
-        if output_dir:
-            output_dir = Path(output_dir)
-            if base_dir:
-                try:
-                    rel = path.resolve().relative_to(base_dir.resolve())
-                except Exception:
-                    rel = Path(path.name)
-            else:
-                rel = Path(path.name)
-            output_path = (output_dir / rel).with_suffix(output_path.suffix)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+        result_content = convert_content(
+            content,
+            final_target,
+            base_url=base_url,
+            base_path=base_dir or path.parent,
+            rewrite_paths=rewrite_paths,
+            drop_unknown_tags=drop_unknown_tags,
+            allowlist_file=allowlist_file,
+        )
+        output_path = _output_path(path, final_target, output_dir, base_dir)
 
-        output_path.write_text(result_content, encoding="utf-8")
-        return conversion_result(True, f"Saved to {output_path}", file_path, output_path=str(output_path))
+        try:
+            if writer is None:
+                with OutputWriter() as own_writer:
+                    output_bytes = own_writer.write_text(output_path, result_content)
+            else:
+                output_bytes = writer.write_text(output_path, result_content)
+        except OSError as e:
+            return failed(str(e), "write")
+        return conversion_result(
+            True,
+            f"Saved to {output_path}",
+            file_path,
+            output_path=str(output_path),
+            output_bytes=output_bytes,
+            input_bytes=input_bytes,
+            duration=time.perf_counter() - started,
+            encoding=encoding,
+        )
 
+    except MemoryError:
+        return failed("Out of memory", "memory")
     except Exception as e:
-        return conversion_result(False, str(e), file_path)
+        return failed(str(e), "error")
+
+
+_BOMS = (
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+
+def decode_source(data: bytes) -> Tuple[str, str]:
+    """
+    Decode source bytes: BOM, then UTF-8, then an HTML <meta charset> in the first 2 KB.
+    Returns (text, encoding); raises UnicodeDecodeError when nothing fits.
+    """
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data.decode(encoding), encoding
+    try:
+        return data.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        match = _META_CHARSET.search(data[:2048])
+        if not match:
+            raise
+        encoding = match.group(1).decode("ascii").lower()
+        try:
+            return data.decode(encoding), encoding
+        except LookupError:
+            raise UnicodeDecodeError("utf-8", data, 0, 1, f"unknown charset {encoding!r}")
+
+
+def _output_path(path: Path, target: str, output_dir: Optional[Path], base_dir: Optional[Path]) -> Path:
+    output_path = path.with_suffix(TARGET_SUFFIXES[target])
+    if output_dir:
+        output_dir = Path(output_dir)
+        if base_dir:
+            try:
+                rel = path.resolve().relative_to(Path(base_dir).resolve())
+            except Exception:
+                rel = Path(path.name)
+        else:
+            rel = Path(path.name)
+        output_path = (output_dir / rel).with_suffix(output_path.suffix)
+    return output_path
 
 
 def batch_convert(
@@ -119,25 +351,94 @@ def batch_convert(
     base_url: Optional[str] = None,
     rewrite_paths: bool = False,
     drop_unknown_tags: bool = False,
-    max_workers: int = 1,
+    max_workers: Union[int, str] = 1,
     pause_callback: Optional[Callable[[], bool]] = None,
     allowlist_file: Optional[Path] = None,
+    control: Optional[BatchControl] = None,
+    stats_callback: Optional[Callable[[BatchProgress], None]] = None,
+    buffer_small_outputs: bool = False,
+    journal_path: Optional[Path] = None,
+    resume: bool = False,
+    file_timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    dedupe: bool = False,
+    hardlink_duplicates: bool = False,
+    schedule: str = "listing",
+    max_workers_cap: Optional[int] = None,
+    result_callback: Optional[Callable[[int, conversion_result], None]] = None,
 ) -> List[conversion_result]:
     """
     Convert a list of files.
-    progress_callback: (current, total, current_filename) -> None
+    max_workers: worker count, or "auto" to grow/shrink it from measured throughput
+    (up to max_workers_cap, default 2 x CPU count).
+    progress_callback: (current, total, current_filename) -> None, called when a file starts
+    stats_callback: (BatchProgress) -> None, called each time a file finishes
+    result_callback: (index, conversion_result) -> None, called each time a file finishes
+    control: shared pause/cancel state; built from the callbacks when omitted.
+    Pausing stops new files from being dispatched, in-flight files still finish.
+    buffer_small_outputs: queue small outputs and write them in bulk.
+    journal_path: append every finished file to this JSONL journal.
+    resume: skip files the journal already records as converted (unchanged source, output present).
+    file_timeout / memory_limit_mb: convert in supervised worker processes that are killed
+    and replaced when a file exceeds either limit (error_code 'timeout' / 'memory').
+    Small-output buffering does not apply in that mode.
+    dedupe: convert byte-identical inputs once and copy (or, with hardlink_duplicates,
+    hardlink) the output to every other destination; results carry duplicate_of.
+    Ignored when rewrite_paths resolves against file locations (no base_url).
+    schedule: 'listing' (input order) or 'largest-first' by file size. In worker-process
+    mode small files are also packed into chunks. Results always come back in input order.
     """
-    results = []
     total = len(files)
+    if control is None:
+        control = BatchControl(cancel_callback=cancel_callback, pause_callback=pause_callback)
+    adaptive = None
+    if max_workers == "auto":
+        adaptive = AdaptiveWorkers(max_workers_cap or (os.cpu_count() or 1) * 2)
+        max_workers = adaptive.cap
+    writer = OutputWriter(buffer_small=buffer_small_outputs)
+    journal = BatchJournal(journal_path) if journal_path else None
+    isolated = None
+    if file_timeout or memory_limit_mb:
+        isolated = IsolatedRunner(max_workers or 1, timeout=file_timeout, memory_limit_mb=memory_limit_mb)
 
-    def worker(idx_path: tuple[int, str]) -> conversion_result:
-        i, file_path = idx_path
-        if cancel_callback and cancel_callback():
-            return conversion_result(False, "Cancelled", "<cancelled>", None)
-        if progress_callback:
-            progress_callback(i + 1, total, os.path.basename(file_path))
-        return convert_file(
-            file_path,
+    ordered = {}
+    todo = list(enumerate(files))
+    if journal and resume:
+        entries = journal.load()
+        todo = []
+        for i, file_path in enumerate(files):
+            record = entries.get(os.path.abspath(file_path))
+            if journal.is_done(record, file_path):
+                ordered[i] = conversion_result(
+                    True, record["message"], file_path, output_path=record["output_path"]
+                )
+            else:
+                todo.append((i, file_path))
+
+    sizes = {i: _file_size(f) for i, f in todo} if stats_callback else {}
+    progress = BatchProgress(len(todo), total_bytes=sum(sizes.values()))
+
+    duplicates = {}
+    if dedupe and not (rewrite_paths and not base_url):
+        todo, duplicates = _group_duplicates(todo, target_format)
+
+    def done(i: int, res: conversion_result) -> None:
+        ordered[i] = res
+        if res.file_path == "<cancelled>":
+            return
+        if journal:
+            journal.record(res.file_path, res.success, res.message, res.output_path)
+        if result_callback:
+            result_callback(i, res)
+        if not stats_callback:
+            return
+        progress.record(os.path.basename(files[i]), res.success, sizes[i], res.output_bytes)
+        stats_callback(progress.snapshot())
+
+    def worker(task: List[tuple[int, str]]) -> List[conversion_result]:
+        if control.cancelled:
+            return [conversion_result(False, "Cancelled", "<cancelled>", None, error_code="cancelled") for _ in task]
+        options = dict(
             target_format=target_format,
             output_dir=output_dir,
             base_dir=base_dir,
@@ -146,29 +447,355 @@ def batch_convert(
             drop_unknown_tags=drop_unknown_tags,
             allowlist_file=allowlist_file,
         )
+        if isolated:
+            if progress_callback:
+                for i, file_path in task:
+                    progress_callback(i + 1, total, os.path.basename(file_path))
+            return isolated.run_many([file_path for _, file_path in task], **options)
+        results = []
+        for i, file_path in task:
+            if progress_callback:
+                progress_callback(i + 1, total, os.path.basename(file_path))
+            results.append(convert_file(file_path, writer=writer, **options))
+        return results
 
-    if max_workers and max_workers > 1:
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            for res in ex.map(worker, list(enumerate(files))):
-                if pause_callback:
-                    while pause_callback():
-                        time.sleep(0.1)
-                results.append(res)
-                if cancel_callback and cancel_callback():
-                    break
+    pack_small = isolated is not None
+    if schedule != "listing" or pack_small:
+        for i, file_path in todo:
+            if i not in sizes:
+                sizes[i] = _file_size(file_path)
+    tasks = _plan_tasks(todo, schedule, sizes, pack_small=pack_small)
+
+    try:
+        _dispatch(tasks, worker, done, control, max_workers, adaptive)
+        if duplicates:
+            writer.flush()
+            for leader, followers in duplicates.items():
+                source = ordered.get(leader)
+                for i, file_path in followers:
+                    if source is not None and source.success and source.output_path not in writer.errors:
+                        res = _copy_output(source, file_path, target_format, output_dir, base_dir, writer, hardlink_duplicates)
+                    else:
+                        res = _leader_failed(source, file_path, writer)
+                    done(i, res)
+    finally:
+        writer.flush()
+        if journal:
+            journal.close()
+        if isolated:
+            isolated.close()
+
+    results = [ordered[i] for i in sorted(ordered)]
+    if writer.errors:
+        for res in results:
+            if res.output_path in writer.errors:
+                res.success = False
+                res.message = writer.errors[res.output_path]
+                res.error_code = "write"
+    return results
+
+
+def _group_duplicates(todo: List[tuple[int, str]], target_format: str):
+    """Split todo into unique leaders and {leader index: [(index, path), ...]} duplicates."""
+    leaders = {}
+    unique = []
+    duplicates = {}
+    for i, file_path in todo:
+        digest = _content_digest(file_path)
+        if digest is None:
+            unique.append((i, file_path))
+            continue
+        key = (digest, resolve_target(target_format, Path(file_path).suffix))
+        if key in leaders:
+            duplicates.setdefault(leaders[key], []).append((i, file_path))
+        else:
+            leaders[key] = i
+            unique.append((i, file_path))
+    return unique, duplicates
+
+
+def _leader_failed(source: Optional[conversion_result], file_path: str, writer: OutputWriter) -> conversion_result:
+    """Failure result for a duplicate whose leader failed, was cancelled or never ran."""
+    if source is None or source.file_path == "<cancelled>":
+        return conversion_result(False, "Cancelled", "<cancelled>", None, error_code="cancelled")
+    if source.success:
+        return conversion_result(False, writer.errors[source.output_path], file_path, error_code="write", duplicate_of=source.file_path)
+    return conversion_result(False, source.message, file_path, error_code=source.error_code, duplicate_of=source.file_path)
+
+
+def _content_digest(path: str) -> Optional[str]:
+    h = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _copy_output(
+    source: conversion_result,
+    file_path: str,
+    target_format: str,
+    output_dir: Optional[Path],
+    base_dir: Optional[Path],
+    writer: OutputWriter,
+    hardlink: bool,
+) -> conversion_result:
+    """Reuse a converted output for a byte-identical input."""
+    path = Path(file_path)
+    try:
+        target = resolve_target(target_format, path.suffix)
+        output_path = _output_path(path, target, output_dir, base_dir)
+        if str(output_path) != source.output_path:
+            if hardlink:
+                writer.link(Path(source.output_path), output_path)
+            else:
+                writer.write_bytes(output_path, Path(source.output_path).read_bytes())
+    except Exception as e:
+        return conversion_result(False, str(e), file_path, error_code="write")
+    return conversion_result(
+        True,
+        f"Saved to {output_path} (duplicate of {source.file_path})",
+        file_path,
+        output_path=str(output_path),
+        output_bytes=source.output_bytes,
+        duplicate_of=source.file_path,
+    )
+
+
+def convert_archive(
+    archive_path: Path,
+    target_format: str = "auto",
+    output_archive: Optional[Path] = None,
+    output_dir: Optional[Path] = None,
+    base_dir: Optional[Path] = None,
+    base_url: Optional[str] = None,
+    rewrite_paths: bool = False,
+    drop_unknown_tags: bool = False,
+    allowlist_file: Optional[Path] = None,
+    max_workers: Union[int, str] = 1,
+    copy_other: bool = True,
+    control: Optional[BatchControl] = None,
+) -> List[conversion_result]:
+    """
+    Convert the HTML/MD members of a zip or tar archive in memory, without extracting.
+    Results go into output_archive (format from its suffix) or, when only output_dir
+    is given, into files under output_dir. Default: <name>_converted<suffix> next to
+    the source. Member paths are preserved; other members are copied unchanged when
+    copy_other is set. With rewrite_paths and no base_url, links resolve against
+    base_dir (default: the archive's folder) joined with the member's folder.
+    output_archive is written to a temp file and moved into place when done; an error
+    leaves any existing archive at that path untouched.
+    max_workers="auto" uses one worker per CPU.
+    """
+    if max_workers == "auto":
+        max_workers = os.cpu_count() or 1
+    archive_path = Path(archive_path)
+    suffix = archive_suffix(archive_path)
+    if suffix is None:
+        return [
+            conversion_result(
+                False, f"Unsupported archive type: {archive_path.name}", str(archive_path), error_code="unsupported"
+            )
+        ]
+    if output_archive is None and output_dir is None:
+        output_archive = archive_path.with_name(archive_path.name[: -len(suffix)] + "_converted" + suffix)
+    control = control or BatchControl()
+    root = Path(base_dir) if base_dir else archive_path.parent
+    results: List[conversion_result] = []
+
+    if output_archive is not None:
+        sink = ArchiveWriter(output_archive)
+        location = lambda name: f"{output_archive}!/{name}"
     else:
-        for i, file_path in enumerate(files):
-            if pause_callback:
-                while pause_callback():
-                    time.sleep(0.1)
-            res = worker((i, file_path))
-            results.append(res)
-            if cancel_callback and cancel_callback():
-                break
+        sink = OutputWriter()
+        location = lambda name: str(Path(output_dir) / name)
+
+    def emit(name: str, data: bytes) -> int:
+        if output_archive is not None:
+            sink.write(name, data)
+        else:
+            sink.write_bytes(Path(output_dir) / name, data)
+        return len(data)
+
+    def convert_member(name: str, target: str, data: bytes):
+        source = f"{archive_path}!/{name}"
+        started = time.perf_counter()
+        stats = dict(input_bytes=len(data))
+        try:
+            content, stats["encoding"] = decode_source(data)
+            text = convert_content(
+                content,
+                target,
+                base_url=base_url,
+                base_path=root / posixpath.dirname(name),
+                rewrite_paths=rewrite_paths,
+                drop_unknown_tags=drop_unknown_tags,
+                allowlist_file=allowlist_file,
+            )
+        except UnicodeDecodeError as e:
+            return conversion_result(False, str(e), source, error_code="decode", **stats), None, None
+        except MemoryError:
+            return conversion_result(False, "Out of memory", source, error_code="memory", **stats), None, None
+        except Exception as e:
+            return conversion_result(False, str(e), source, error_code="error", **stats), None, None
+        out_name = posixpath.splitext(name)[0] + TARGET_SUFFIXES[target]
+        res = conversion_result(
+            True, "", source, output_path=location(out_name), duration=time.perf_counter() - started, **stats
+        )
+        return res, out_name, text
+
+    def flush(converted) -> None:
+        res, out_name, text = converted
+        if res.success:
+            try:
+                res.output_bytes = emit(out_name, text.encode("utf-8"))
+                res.message = f"Saved to {res.output_path}"
+            except Exception as e:
+                res.success, res.message, res.output_path, res.error_code = False, str(e), None, "write"
+        results.append(res)
 
+    # bounded window keeps output order stable while members convert in parallel
+    window = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers and max_workers > 1 else None
+    try:
+        for raw_name, data in iter_archive(archive_path):
+            if not control.wait_until_resumed():
+                break
+            name = safe_member_name(raw_name)
+            if name is None:
+                results.append(
+                    conversion_result(False, "Unsafe member path", f"{archive_path}!/{raw_name}", error_code="unsupported")
+                )
+                continue
+            target = resolve_target(target_format, posixpath.splitext(name)[1])
+            if target is None:
+                if copy_other:
+                    emit(name, data)
+                continue
+            if executor is None:
+                flush(convert_member(name, target, data))
+                continue
+            window.append(executor.submit(convert_member, name, target, data))
+            if len(window) >= max_workers * 2:
+                flush(window.popleft().result())
+        while window:
+            flush(window.popleft().result())
+    except BaseException:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if output_archive is not None:
+            sink.discard()
+        else:
+            sink.close()
+        raise
+    if executor is not None:
+        executor.shutdown()
+    sink.close()
     return results
 
 
+def _dispatch(
+    tasks: List[List[tuple[int, str]]],
+    worker: Callable[[List[tuple[int, str]]], List[conversion_result]],
+    done: Callable[[int, conversion_result], None],
+    control: BatchControl,
+    max_workers: int,
+    adaptive: Optional[AdaptiveWorkers] = None,
+) -> None:
+    """
+    Run worker over tasks (lists of (index, path)), honouring pause/cancel between dispatches.
+    With adaptive, the number of tasks in flight follows adaptive.limit (max_workers is the pool size).
+    """
+    if adaptive is None and (not max_workers or max_workers <= 1):
+        for task in tasks:
+            if not control.wait_until_resumed():
+                break
+            for (i, _), res in zip(task, worker(task)):
+                done(i, res)
+            if control.cancelled:
+                break
+        return
+
+    # Only max_workers tasks are ever submitted, so a pause or cancel
+    # never leaves a backlog of queued work running in the pool.
+    pending = {}
+    queue = iter(tasks)
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        while True:
+            limit = adaptive.limit if adaptive else max_workers
+            while not exhausted and len(pending) < limit and not control.paused and not control.cancelled:
+                task = next(queue, None)
+                if task is None:
+                    exhausted = True
+                    break
+                pending[ex.submit(worker, task)] = task
+            if control.cancelled:
+                for fut in list(pending):
+                    if fut.cancel():
+                        del pending[fut]
+            if not pending:
+                if exhausted or not control.wait_until_resumed():
+                    break
+                continue
+            finished, _ = wait(pending, timeout=control.poll_interval if control.paused else None, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                task = pending.pop(fut)
+                for (i, _), res in zip(task, fut.result()):
+                    done(i, res)
+                if adaptive:
+                    adaptive.record(len(task))
+
+
+SCHEDULES = ("listing", "largest-first")
+
+
+def _plan_tasks(
+    todo: List[tuple[int, str]],
+    schedule: str,
+    sizes: dict,
+    pack_small: bool = False,
+    chunk_files: int = 16,
+    small_file_bytes: int = 64 * 1024,
+) -> List[List[tuple[int, str]]]:
+    """
+    Order files by schedule and group them into tasks.
+    'largest-first' (LPT) starts the biggest files first so no worker is left
+    grinding on a large file at the end. With pack_small, files under
+    small_file_bytes are packed chunk_files at a time to amortise IPC.
+    """
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown schedule: {schedule}")
+    items = list(todo)
+    if schedule == "largest-first":
+        items.sort(key=lambda item: sizes.get(item[0], 0), reverse=True)
+    if not pack_small:
+        return [[item] for item in items]
+    tasks = []
+    chunk = []
+    for item in items:
+        if sizes.get(item[0], 0) >= small_file_bytes:
+            tasks.append([item])
+            continue
+        chunk.append(item)
+        if len(chunk) >= chunk_files:
+            tasks.append(chunk)
+            chunk = []
+    if chunk:
+        tasks.append(chunk)
+    return tasks
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
 def get_files_in_directory(
     directory: str, extensions: List[str], recursive: bool = False
 ) -> List[str]:
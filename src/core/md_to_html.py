@@ -3,7 +3,7 @@ Muya 风格 Markdown 渲染器 - 纯 Python 实现
 基于 MarkText/Muya 的正则规则，修复了中文支持
 """
 import re
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 from .path_utils import resolve_url
 
@@ -103,6 +103,144 @@ class MuyaRenderer:
         return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
 
 
+# tokens that decide whether a blank line can split the document
+_BLOCK_TOKENS = re.compile(r'\n\n|\n|```|\]\(|\[|\]|\)')
+# a heading with no text yet or a bare '>': their patterns reach across a blank line
+_OPEN_LINE = re.compile(r'#{1,6}\s*|>')
+
+
+class _BlockCuts:
+    """
+    Finds the offsets where a Markdown document can be cut into pieces that
+    render independently, reading the text in order. Breaks are the blank lines
+    MuyaRenderer splits paragraphs at ('\n\n', left to right), except inside
+    fenced code, in an open link or image, or in the whitespace after an empty
+    heading or bare '>' line. Only the last two characters are rescanned
+    between feeds.
+    """
+
+    def __init__(self):
+        self.offset = 0  # document offset of self._buf
+        self._buf = ''
+        self._fences = 0
+        # '[' still waiting for a ']', and '](' for a ')'. Counted rather than
+        # flagged: image and link substitutions remove balanced pairs, so the
+        # counts hold for the text each later pattern sees.
+        self._brackets = 0
+        self._targets = 0
+        self._line = ''  # start of the current line, enough for _OPEN_LINE
+        self._open = False  # after an _OPEN_LINE, until the next non-blank text
+        self._block = 0
+
+    def feed(self, text: str, final: bool = False) -> List[int]:
+        buf = self._buf + text
+        # a token starting in the last two characters may still grow ('`' -> '```', ']' -> '](')
+        limit = len(buf) if final else len(buf) - 2
+        cuts = []
+        pos = 0
+        for m in _BLOCK_TOKENS.finditer(buf):
+            if m.start() >= limit:
+                break
+            token = m.group()
+            self._add_line(buf[pos:m.start()])
+            if token[0] == '\n':
+                if _OPEN_LINE.fullmatch(self._line):
+                    self._open = True
+                at = self.offset + m.start()
+                if (
+                    token == '\n\n'
+                    and at > self._block
+                    and self._fences % 2 == 0
+                    and not (self._brackets or self._targets or self._open)
+                ):
+                    cuts.append(at)
+                    self._block = at
+                self._line = ''
+            else:
+                self._add_line(token)
+                if token == '```':
+                    self._fences += 1
+                elif token == '[':
+                    self._brackets += 1
+                elif token == ']':
+                    self._brackets = max(0, self._brackets - 1)
+                elif token == '](':
+                    self._brackets = max(0, self._brackets - 1)
+                    self._targets += 1
+                else:
+                    self._targets = max(0, self._targets - 1)
+            pos = m.end()
+        if pos < limit:
+            self._add_line(buf[pos:limit])
+            pos = limit
+        self._buf = buf[pos:]
+        self.offset += pos
+        return cuts
+
+    def _add_line(self, text: str) -> None:
+        if len(self._line) < 8:
+            self._line = (self._line + text)[:8]
+        if text and not text.isspace():
+            self._open = False
+
+
+class MarkdownToHTMLStream:
+    """
+    Incremental markdown_to_html: feed() Markdown in chunks and get back the HTML
+    for the blocks completed so far, then close() for the rest. Input is cut
+    where split_blocks cuts it, so the output matches markdown_to_html on the
+    whole document, except where emphasis, strikethrough or a code span is left
+    open across a blank line, or fences are unbalanced.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        base_path: Optional[Path] = None,
+        rewrite_paths: bool = False,
+    ):
+        self.renderer = MuyaRenderer(base_url=base_url, base_path=base_path, rewrite_paths=rewrite_paths)
+        self._cuts = _BlockCuts()
+        self._parts: List[str] = []
+        self._start = 0  # document offset of the pending text
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        self._parts.append(chunk)
+        cuts = self._cuts.feed(chunk)
+        if not cuts:
+            return ''
+        pending = ''.join(self._parts)
+        end = cuts[-1] - self._start
+        self._parts = [pending[end:]]
+        self._start = cuts[-1]
+        return self._emit(pending[:end])
+
+    def close(self) -> str:
+        pending, self._parts = ''.join(self._parts), []
+        return self._emit(pending)
+
+    def _emit(self, markdown: str) -> str:
+        html = self.renderer.render(markdown)
+        if not html:
+            return ''
+        if self._started:
+            html = '\n' + html
+        self._started = True
+        return html
+
+
+def split_blocks(markdown: str) -> List[str]:
+    """
+    Cut Markdown into the pieces MarkdownToHTMLStream renders one at a time.
+    Pieces after the first keep their leading blank line, so ''.join(pieces)
+    == markdown. Joining the non-empty renders of the pieces with '\n' gives
+    markdown_to_html, with the same exceptions as the stream.
+    """
+    cuts = _BlockCuts().feed(markdown, final=True)
+    return [markdown[a:b] for a, b in zip([0] + cuts, cuts + [len(markdown)])]
+
+
 def markdown_to_html(
     markdown_content: str,
     base_url: Optional[str] = None,
@@ -0,0 +1,218 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_timing: ContextVar[Optional["ServerTiming"]] = ContextVar("server_timing", default=None)
+
+
+class ServerTiming:
+    """
+    Per-request stage timer behind the Server-Timing header.
+    Handlers time their work with timed("convert"); parse is the time from the
+    request arriving to the first stage, serialize the time from the last stage
+    to the response headers.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+
+    def add(self, stage: str, began: float, ended: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + (ended - began)
+        if self._first is None:
+            self._first = began
+        self._last = ended
+
+    def breakdown(self, now: Optional[float] = None) -> Dict[str, float]:
+        now = now or time.perf_counter()
+        out = {}
+        if self._first is not None:
+            out["parse"] = self._first - self.start
+            out.update(self.stages)
+            out["serialize"] = now - self._last
+        out["total"] = now - self.start
+        return out
+
+    def header(self, now: Optional[float] = None) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.breakdown(now).items())
+
+
+@contextmanager
+def timed(stage: str):
+    """Time a block as a Server-Timing stage of the current request (no-op outside one)."""
+    timing = _timing.get()
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timing is not None:
+            timing.add(stage, began, time.perf_counter())
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class Metrics:
+    """
+    Request metrics in Prometheus text format, without a client library:
+    request counts, latency histograms, bytes in/out per handler, an in-flight
+    gauge and Server-Timing stage totals. Other components report through
+    add_sample() callbacks that are read at scrape time.
+    """
+
+    def __init__(self, prefix: str = "converter", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self._requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self._latency: Dict[str, List[float]] = {}  # handler -> bucket counts, then sum, count
+        self._bytes_in: Dict[str, int] = defaultdict(int)
+        self._bytes_out: Dict[str, int] = defaultdict(int)
+        self._stages: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        self._samples: List[Tuple[str, str, str, Callable[[], float]]] = []
+        self._lock = threading.Lock()
+
+    def add_sample(self, name: str, kind: str, help_text: str, read: Callable[[], float]) -> None:
+        """Register a gauge/counter whose value is read when /metrics is scraped."""
+        self._samples.append((name, kind, help_text, read))
+
+    def observe(
+        self,
+        handler: str,
+        method: str,
+        status: int,
+        seconds: float,
+        bytes_in: int,
+        bytes_out: int,
+        stages: Optional[Dict[str, float]] = None,
+    ) -> None:
+        with self._lock:
+            self._requests[(handler, method, status)] += 1
+            hist = self._latency.get(handler)
+            if hist is None:
+                hist = self._latency[handler] = [0] * (len(self.buckets) + 3)
+            hist[bisect_left(self.buckets, seconds)] += 1
+            hist[-2] += seconds
+            hist[-1] += 1
+            self._bytes_in[handler] += bytes_in
+            self._bytes_out[handler] += bytes_out
+            for stage, spent in (stages or {}).items():
+                if stage != "total":
+                    totals = self._stages[stage]
+                    totals[0] += spent
+                    totals[1] += 1
+
+    def render(self) -> str:
+        p = self.prefix
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        with self._lock:
+            family("http_requests_total", "counter", "HTTP requests by handler, method and status.")
+            for (handler, method, status), count in sorted(self._requests.items()):
+                lines.append(f"{p}_http_requests_total{_labels(handler=handler, method=method, status=status)} {count}")
+
+            family("http_request_duration_seconds", "histogram", "HTTP request latency by handler.")
+            for handler, hist in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), hist):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{p}_http_request_duration_seconds_bucket{_labels(handler=handler, le=le)} {cumulative}")
+                lines.append(f"{p}_http_request_duration_seconds_sum{_labels(handler=handler)} {hist[-2]:.6f}")
+                lines.append(f"{p}_http_request_duration_seconds_count{_labels(handler=handler)} {hist[-1]}")
+
+            family("http_requests_in_flight", "gauge", "HTTP requests currently being served.")
+            lines.append(f"{p}_http_requests_in_flight {self.in_flight}")
+
+            family("http_request_bytes_total", "counter", "Request body bytes received by handler.")
+            for handler, count in sorted(self._bytes_in.items()):
+                lines.append(f"{p}_http_request_bytes_total{_labels(handler=handler)} {count}")
+            family("http_response_bytes_total", "counter", "Response body bytes sent by handler.")
+            for handler, count in sorted(self._bytes_out.items()):
+                lines.append(f"{p}_http_response_bytes_total{_labels(handler=handler)} {count}")
+
+            family("stage_seconds_total", "counter", "Time spent per Server-Timing stage.")
+            for stage, (spent, _) in sorted(self._stages.items()):
+                lines.append(f"{p}_stage_seconds_total{_labels(stage=stage)} {spent:.6f}")
+            family("stage_count_total", "counter", "Requests that went through each Server-Timing stage.")
+            for stage, (_, count) in sorted(self._stages.items()):
+                lines.append(f"{p}_stage_count_total{_labels(stage=stage)} {count}")
+
+        for name, kind, help_text, read in self._samples:
+            try:
+                value = read()
+            except Exception:
+                continue
+            family(name, kind, help_text)
+            lines.append(f"{p}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that feeds Metrics and adds a Server-Timing header.
+    Requests are labelled by endpoint function name (not raw path) to keep the
+    label set bounded; unrouted requests count as 'unmatched'.
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = ServerTiming()
+        token = _timing.set(timing)
+        state = {"status": 500, "in": 0, "out": 0, "stages": None}
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["in"] += len(message.get("body", b""))
+            return message
+
+        async def timing_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                state["stages"] = timing.breakdown()
+                header = timing.header().encode("latin-1")
+                message = dict(message, headers=list(message.get("headers", [])) + [(b"server-timing", header)])
+            elif message["type"] == "http.response.body":
+                state["out"] += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, counting_receive, timing_send)
+        finally:
+            self.metrics.in_flight -= 1
+            _timing.reset(token)
+            endpoint = scope.get("endpoint")
+            self.metrics.observe(
+                getattr(endpoint, "__name__", "unmatched"),
+                scope.get("method", ""),
+                state["status"],
+                time.perf_counter() - timing.start,
+                state["in"],
+                state["out"],
+                state["stages"],
+            )
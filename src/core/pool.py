@@ -0,0 +1,92 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from .isolation import IsolatedRunner
+from .manager import convert_content
+from .settings import env_setting
+
+
+class ConversionPool:
+    """
+    Runs CPU-bound conversions for the async API without blocking the event loop.
+    Work goes to a bounded set of worker processes (IsolatedRunner). A call that
+    exceeds the timeout has its worker killed and raises TimeoutError. Calls
+    beyond the pool size wait their turn. Content up to inline_bytes is converted
+    on a thread instead, so small requests never queue behind large ones; those
+    calls also raise TimeoutError, but the thread cannot be killed and runs on.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        timeout: Optional[float] = 30.0,
+        inline_bytes: int = 16 * 1024,
+        memory_limit_mb: Optional[int] = None,
+    ):
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.inline_bytes = inline_bytes
+        self.memory_limit_mb = memory_limit_mb
+        self.active = 0  # worker calls running or waiting for a worker
+        self._runner: Optional[IsolatedRunner] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Worker calls waiting for a free worker."""
+        return max(0, self.active - self.size)
+
+    @classmethod
+    def from_env(cls) -> "ConversionPool":
+        """Configure from CONVERTER_POOL_SIZE, CONVERTER_TIMEOUT, CONVERTER_INLINE_BYTES and CONVERTER_MEMORY_LIMIT_MB."""
+        return cls(
+            size=env_setting("CONVERTER_POOL_SIZE", None),
+            timeout=env_setting("CONVERTER_TIMEOUT", 30.0, float) or None,
+            inline_bytes=env_setting("CONVERTER_INLINE_BYTES", 16 * 1024),
+            memory_limit_mb=env_setting("CONVERTER_MEMORY_LIMIT_MB", None),
+        )
+
+    def start(self) -> None:
+        """Create the workers in the background so the first requests don't pay for process startup."""
+        if self._runner is not None:
+            return
+        self._runner = IsolatedRunner(self.size, timeout=self.timeout, memory_limit_mb=self.memory_limit_mb)
+        self._threads = ThreadPoolExecutor(self.size, thread_name_prefix="conversion")
+        for _ in range(self.size):
+            self._threads.submit(self._runner.call, len, ())
+
+    def close(self) -> None:
+        if self._runner is None:
+            return
+        self._threads.shutdown(wait=True, cancel_futures=True)
+        self._runner.close()
+        self._runner = None
+        self._threads = None
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) in a worker process. fn must be picklable (a module-level function)."""
+        return await self.run_within(self.timeout, fn, *args, **kwargs)
+
+    async def run_within(self, timeout: Optional[float], fn, *args, **kwargs):
+        """run() with its own timeout, e.g. one scaled to the input size."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        self.active += 1
+        try:
+            return await loop.run_in_executor(
+                self._threads, partial(self._runner.call_within, timeout, fn, *args, **kwargs)
+            )
+        finally:
+            self.active -= 1
+
+    async def convert(self, content: str, target: str, **options) -> str:
+        """convert_content(content, target, **options), inline for small content, else in a worker."""
+        if len(content) <= self.inline_bytes:
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(convert_content, content, target, **options), self.timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Timed out after {self.timeout:g}s") from None
+        return await self.run(convert_content, content, target, **options)
@@ -0,0 +1,89 @@
+import copy
+import time
+from collections import deque
+from typing import Optional
+
+
+class BatchProgress:
+    """
+    Completion-based progress for a batch run.
+    Rates are moving averages over the last `window` finished files;
+    the ETA is weighted by the bytes still waiting to be converted.
+    """
+
+    def __init__(self, total: int, total_bytes: int = 0, window: int = 20):
+        self.total = total
+        self.total_bytes = total_bytes
+        self.succeeded = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.files_per_sec = 0.0
+        self.mb_per_sec = 0.0
+        self.elapsed = 0.0
+        self.eta: Optional[float] = None
+        self.current = ""
+        self._started = time.monotonic()
+        # (timestamp, bytes_in) per finished file, seeded with the start time
+        self._samples = deque([(self._started, 0)], maxlen=window + 1)
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def remaining_bytes(self) -> int:
+        return max(self.total_bytes - self.bytes_in, 0)
+
+    @property
+    def percent(self) -> int:
+        return int(self.completed * 100 / self.total) if self.total else 100
+
+    def record(self, name: str, success: bool, bytes_in: int = 0, bytes_out: int = 0) -> None:
+        now = time.monotonic()
+        self.current = name
+        if success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.elapsed = now - self._started
+        self._samples.append((now, bytes_in))
+
+        span = now - self._samples[0][0]
+        if span > 0:
+            self.files_per_sec = (len(self._samples) - 1) / span
+            self.mb_per_sec = sum(b for _, b in list(self._samples)[1:]) / span / (1024 * 1024)
+
+        remaining_files = self.total - self.completed
+        if remaining_files <= 0:
+            self.eta = 0.0
+        elif self.total_bytes and self.mb_per_sec > 0:
+            self.eta = self.remaining_bytes / (self.mb_per_sec * 1024 * 1024)
+        elif self.files_per_sec > 0:
+            self.eta = remaining_files / self.files_per_sec
+        else:
+            self.eta = None
+
+    def snapshot(self) -> "BatchProgress":
+        """Detached copy that is safe to hand to another thread."""
+        snap = copy.copy(self)
+        snap._samples = deque(self._samples, maxlen=self._samples.maxlen)
+        return snap
+
+    def describe(self) -> str:
+        eta = format_duration(self.eta) if self.eta is not None else "--:--"
+        return (
+            f"[{self.completed}/{self.total}] {self.failed} failed | "
+            f"{self.files_per_sec:.1f} files/s | {self.mb_per_sec:.2f} MB/s | ETA {eta}"
+        )
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# bump when converter output changes, so old ETags and cache entries stop matching
+KEY_VERSION = 1
+
+
+def cache_key(content: str, target: str, **options) -> str:
+    """Stable hash of a conversion's inputs; doubles as its ETag."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([KEY_VERSION, target, options], sort_keys=True, default=str).encode("utf-8"))
+    h.update(b"\0")
+    h.update(content.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 asks for)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == bare:
+            return True
+    return False
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of conversion results, bounded by memory (max_bytes,
+    measured with sys.getsizeof). Counts hits, misses, evictions and 304s.
+    max_bytes=0 disables it.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        cost = sys.getsizeof(key) + sys.getsizeof(value)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= sys.getsizeof(key) + sys.getsizeof(old)
+            self._entries[key] = value
+            self.size += cost
+            while self.size > self.max_bytes:
+                k, v = self._entries.popitem(last=False)
+                self.size -= sys.getsizeof(k) + sys.getsizeof(v)
+                self.evictions += 1
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "not_modified": self.not_modified,
+            }
@@ -1,4 +1,5 @@
 import json
+import os
 import sys
 from pathlib import Path
 from typing import Dict, Any
@@ -34,3 +35,14 @@ def save_settings(data: Dict[str, Any]) -> None:
     to_save = DEFAULT_SETTINGS.copy()
     to_save.update(data)
     SETTINGS_PATH.write_text(json.dumps(to_save, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def env_setting(name: str, default, cast=int):
+    """Read a server setting from the environment; unset or malformed values give default."""
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        return default
@@ -0,0 +1,158 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .settings import env_setting
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+# a hit refreshes the entry's LRU timestamp at most this often, to keep reads mostly read-only
+_TOUCH_INTERVAL = 60.0
+
+
+class SharedCache:
+    """
+    Size-bounded key/value cache in a SQLite database in WAL mode, shared by
+    every server process on the host. Readers never block on writers. Entries
+    may expire (ttl). When the stored size passes max_bytes, the least recently
+    used entries are deleted until it is under 90% of the budget. The size is
+    checked every check_every writes. Each thread gets its own connection, and
+    SQLite errors count as misses or skipped writes, never request failures.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 256 * 1024 * 1024, check_every: int = 64):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.check_every = max(1, check_every)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._evict()
+
+    @classmethod
+    def from_env(cls, default_dir: Path) -> Optional["SharedCache"]:
+        """
+        Configure from CONVERTER_SHARED_CACHE (database path, default default_dir/shared_cache.sqlite3)
+        and CONVERTER_SHARED_CACHE_MB (default 256). Returns None when the size is 0.
+        """
+        max_mb = env_setting("CONVERTER_SHARED_CACHE_MB", 256.0, float)
+        if max_mb <= 0:
+            return None
+        path = env_setting("CONVERTER_SHARED_CACHE", default_dir / "shared_cache.sqlite3", Path)
+        return cls(path, int(max_mb * 1024 * 1024))
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT value, accessed, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[2] is not None and row[2] < now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is not None and now - row[1] > _TOUCH_INTERVAL:
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.debug("shared cache read failed: %s", e)
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        size = len(key) + len(value.encode("utf-8", "surrogatepass"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed, expires) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now + ttl if ttl else None),
+            )
+        except sqlite3.Error as e:
+            logger.debug("shared cache write failed: %s", e)
+            return
+        with self._lock:
+            self._writes += 1
+            check = self._writes % self.check_every == 0
+        if check:
+            self._evict()
+
+    def stats(self) -> dict:
+        try:
+            entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        except sqlite3.Error:
+            entries = size = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _evict(self) -> None:
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")  # one process evicts at a time
+            try:
+                conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                excess = total - int(self.max_bytes * 0.9)
+                if total > self.max_bytes:
+                    victims = []
+                    for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                        if excess <= 0:
+                            break
+                        victims.append((key,))
+                        excess -= size
+                    conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+                    with self._lock:
+                        self.evictions += len(victims)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.debug("shared cache eviction failed: %s", e)
@@ -0,0 +1,74 @@
+import codecs
+import json
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, TextIO
+
+from .html_to_md import HTMLToMarkdownStream
+from .md_to_html import MarkdownToHTMLStream
+
+CHUNK_SIZE = 256 * 1024
+
+
+def _convert_stream(src: BinaryIO, out: TextIO, target: str, chunk_size: int, **options) -> None:
+    if target == "md":
+        converter = HTMLToMarkdownStream(**options)
+    elif target == "html":
+        converter = MarkdownToHTMLStream(**options)
+    else:
+        raise ValueError(f"Invalid target format: {target}")
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        chunk = src.read(chunk_size)
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            out.write(converter.feed(text))
+        if not chunk:
+            break
+    out.write(converter.close())
+
+
+def convert_upload(
+    src: BinaryIO,
+    target: str,
+    spool_bytes: int,
+    spool_dir: Optional[Path] = None,
+    chunk_size: int = CHUNK_SIZE,
+    **options,
+) -> TextIO:
+    """
+    Convert a UTF-8 file object chunk by chunk with the streaming converters
+    (target 'md' for HTML input, 'html' for Markdown). The output goes to a
+    SpooledTemporaryFile that moves to disk past spool_bytes. Neither the
+    input nor the result is held whole. The caller closes the returned file,
+    which is rewound to the start.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=spool_bytes, mode="w+", encoding="utf-8", newline="", dir=spool_dir)
+    try:
+        _convert_stream(src, out, target, chunk_size, **options)
+        out.seek(0)
+    except BaseException:
+        out.close()
+        raise
+    return out
+
+
+def convert_upload_file(src_path: str, dst_path: str, target: str, chunk_size: int = CHUNK_SIZE, **options) -> None:
+    """convert_upload from one file to another, for running in a worker process."""
+    with open(src_path, "rb") as src, open(dst_path, "w", encoding="utf-8", newline="") as out:
+        _convert_stream(src, out, target, chunk_size, **options)
+
+
+def iter_json_with_text(fields: dict, key: str, text: TextIO, chunk_chars: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Serialize {**fields, key: text.read()} as compact JSON, reading text in
+    chunks so a large result is never one string.
+    """
+    head = json.dumps(fields, ensure_ascii=False, separators=(",", ":"))[:-1]
+    yield f'{head}{"," if fields else ""}{json.dumps(key)}:"'.encode("utf-8")
+    while True:
+        piece = text.read(chunk_chars)
+        if not piece:
+            break
+        yield json.dumps(piece, ensure_ascii=False)[1:-1].encode("utf-8")
+    yield b'"}'
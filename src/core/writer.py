@@ -0,0 +1,137 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+_mode_lock = threading.Lock()
+_file_mode: Optional[int] = None
+
+
+def _read_umask() -> int:
+    # /proc reports the umask without changing it; toggling os.umask races with other threads
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def file_mode() -> int:
+    """
+    Mode a plain open() would give a new file (0o666 minus the umask), read once.
+    mkstemp creates 0600 files, so temp outputs are chmodded to this before os.replace.
+    """
+    global _file_mode
+    with _mode_lock:
+        if _file_mode is None:
+            _file_mode = 0o666 & ~_read_umask()
+        return _file_mode
+
+
+class OutputWriter:
+    """
+    Atomic output writer shared by a batch.
+    Every file goes through a temp file in the target folder plus os.replace,
+    so a killed run never leaves half-written outputs. Created directories are
+    remembered to avoid a mkdir per file. With buffer_small=True, outputs under
+    small_file_limit are queued and flushed together once buffer_limit is reached.
+    """
+
+    def __init__(
+        self,
+        buffer_small: bool = False,
+        small_file_limit: int = 64 * 1024,
+        buffer_limit: int = 4 * 1024 * 1024,
+    ):
+        self.buffer_small = buffer_small
+        self.small_file_limit = small_file_limit
+        self.buffer_limit = buffer_limit
+        self.errors: Dict[str, str] = {}
+        self._created_dirs: Set[Path] = set()
+        self._pending: List[Tuple[Path, bytes]] = []
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+
+    def ensure_dir(self, directory: Path) -> None:
+        if directory in self._created_dirs:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._created_dirs.add(directory)
+            self._created_dirs.update(directory.parents)
+
+    def write_text(self, path: Path, text: str, encoding: str = "utf-8") -> int:
+        """Write text atomically (or queue it). Returns the encoded size in bytes."""
+        data = text.encode(encoding)
+        self.write_bytes(Path(path), data)
+        return len(data)
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        if self.buffer_small and len(data) < self.small_file_limit:
+            with self._lock:
+                self._pending.append((path, data))
+                self._pending_bytes += len(data)
+                full = self._pending_bytes >= self.buffer_limit
+            if full:
+                self.flush()
+            return
+        self._write_atomic(path, data)
+
+    def link(self, source: Path, path: Path) -> None:
+        """Atomically hardlink path to source, falling back to a copy across devices."""
+        self.ensure_dir(path.parent)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.lnk")
+        try:
+            os.link(source, tmp)
+        except OSError:
+            self._write_atomic(path, Path(source).read_bytes())
+            return
+        try:
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def flush(self) -> None:
+        """Write all queued outputs. Failures are collected in self.errors."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._pending_bytes = 0
+        for path, data in pending:
+            try:
+                self._write_atomic(path, data)
+            except Exception as e:
+                self.errors[str(path)] = str(e)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        self.ensure_dir(path.parent)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, file_mode())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
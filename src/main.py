@@ -1,25 +1,58 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Body
+from fastapi import FastAPI, UploadFile, File, HTTPException, Body, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-import shutil
+from starlette.background import BackgroundTask
+import asyncio
+import codecs
+import json
+import logging
 import os
+import shutil
 import tempfile
+import time
 from pathlib import Path
 from typing import List, Optional
-import requests
-import pyperclip
+from urllib.parse import quote
 
 try:
-    from src.converter import Converter  # when imported as a package
-    from src.core import manager
-    from src.core.exporter import export_content, ExportError
-    from src.core.feature_flags import get_feature_status
+    from src.core import manager  # when imported as a package
+    from src.core.exporter import export_content_spooled, ExportError
+    from src.core.feature_flags import get_feature_status, has_module
+    from src.core.pool import ConversionPool
+    from src.core.http_fetch import AsyncFetcher, FetchError
+    from src.core.browser_pool import BrowserPool
+    from src.core.html_to_md import HTMLToMarkdownStream
+    from src.core.md_to_html import MarkdownToHTMLStream
+    from src.core.bulk import convert_items
+    from src.core.jobs import JobQueue, result_entry
+    from src.core.settings import env_setting
+    from src.core.result_cache import ResultCache, cache_key, etag_matches
+    from src.core.shared_cache import SharedCache
+    from src.core.live import LiveSession, StaleVersion
+    from src.core.upload import convert_upload_file, iter_json_with_text
+    from src.core.metrics import Metrics, MetricsMiddleware, timed
+    from src.core.admission import AdmissionControl, AdmissionMiddleware
 except ImportError:
-    from converter import Converter
     from core import manager
-    from core.exporter import export_content, ExportError
-    from core.feature_flags import get_feature_status
+    from core.exporter import export_content_spooled, ExportError
+    from core.feature_flags import get_feature_status, has_module
+    from core.pool import ConversionPool
+    from core.http_fetch import AsyncFetcher, FetchError
+    from core.browser_pool import BrowserPool
+    from core.html_to_md import HTMLToMarkdownStream
+    from core.md_to_html import MarkdownToHTMLStream
+    from core.bulk import convert_items
+    from core.jobs import JobQueue, result_entry
+    from core.settings import env_setting
+    from core.result_cache import ResultCache, cache_key, etag_matches
+    from core.shared_cache import SharedCache
+    from core.live import LiveSession, StaleVersion
+    from core.upload import convert_upload_file, iter_json_with_text
+    from core.metrics import Metrics, MetricsMiddleware, timed
+    from core.admission import AdmissionControl, AdmissionMiddleware
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="HTML <-> MD Converter")
 
@@ -30,12 +63,146 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
 
 # Temp directory for processing
 TEMP_DIR = Path(tempfile.gettempdir()) / "html_md_converter"
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
+# Exports above this size are spilled to a per-request temp file instead of kept in memory
+EXPORT_SPILL_BYTES = int(env_setting("CONVERTER_EXPORT_SPILL_MB", 8.0, float) * 1024 * 1024)
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# Uploads above this size are converted chunk by chunk in a pool worker, through
+# files in TEMP_DIR (CONVERTER_UPLOAD_SPOOL_MB)
+UPLOAD_SPOOL_BYTES = int(env_setting("CONVERTER_UPLOAD_SPOOL_MB", 1.0, float) * 1024 * 1024)
+# /api/convert/file has its own body limit (CONVERTER_UPLOAD_MAX_MB, default 500), and
+# large uploads get CONVERTER_UPLOAD_SECONDS_PER_MB (default 8, about twice the measured
+# 2.5-3.5 s/MB) per MB when that is longer than CONVERTER_TIMEOUT
+UPLOAD_MAX_BYTES = int(env_setting("CONVERTER_UPLOAD_MAX_MB", 500.0, float) * 1024 * 1024)
+UPLOAD_SECONDS_PER_MB = env_setting("CONVERTER_UPLOAD_SECONDS_PER_MB", 8.0, float)
+
+# /api/convert/stream converts on threads in this process; total conversion time per
+# request is capped by CONVERTER_STREAM_TIMEOUT seconds (0 disables)
+STREAM_TIMEOUT = env_setting("CONVERTER_STREAM_TIMEOUT", 300.0, float) or None
+
+# Conversions run off the event loop; size/timeout come from CONVERTER_* env vars
+POOL = ConversionPool.from_env()
+# Pooled, per-host limited URL fetching; limits/timeouts from CONVERTER_FETCH_* env vars
+FETCHER = AsyncFetcher.from_env()
+# Headless browsers for dynamic=True, reused across requests (CONVERTER_BROWSER* env vars)
+BROWSERS = BrowserPool.from_env()
+# Text conversion results by content hash (CONVERTER_CACHE_MB, 0 disables)
+RESULTS = ResultCache(int(env_setting("CONVERTER_CACHE_MB", 64, float) * 1024 * 1024))
+# Second tier shared by all worker processes on the host, also caching fetched pages
+# (CONVERTER_SHARED_CACHE / _MB, 0 disables; CONVERTER_FETCH_CACHE_TTL seconds, 0 disables)
+SHARED_CACHE = SharedCache.from_env(TEMP_DIR)
+FETCH_CACHE_TTL = env_setting("CONVERTER_FETCH_CACHE_TTL", 300.0, float)
+# Open live-preview sessions, one per WebSocket (CONVERTER_LIVE_MAX_CHARS caps each document)
+LIVE_SESSIONS = set()
+LIVE_MAX_CHARS = env_setting("CONVERTER_LIVE_MAX_CHARS", 5_000_000)
+# Background batch jobs (CONVERTER_JOB_CONCURRENCY / _RETENTION / _WORKERS)
+JOBS = JobQueue(
+    concurrency=env_setting("CONVERTER_JOB_CONCURRENCY", 1),
+    retention=env_setting("CONVERTER_JOB_RETENTION", 3600.0, float),
+    max_workers=env_setting("CONVERTER_JOB_WORKERS", "auto", lambda v: v if v == "auto" else int(v)),
+)
+
+# Admission control in front of the pool: body limit, bounded concurrency and queue,
+# optional per-client rate limit (CONVERTER_MAX_BODY_MB, CONVERTER_MAX_CONCURRENT, ...)
+ADMISSION = AdmissionControl.from_env(POOL.size)
+app.add_middleware(
+    AdmissionMiddleware,
+    control=ADMISSION,
+    max_body=int(env_setting("CONVERTER_MAX_BODY_MB", 50.0, float) * 1024 * 1024),
+    prefixes=("/api/convert", "/api/export", "/api/batch"),
+    body_limits={"/api/convert/file": UPLOAD_MAX_BYTES},
+)
+# added last so it is outermost and also sees rejected requests
+METRICS = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=METRICS)
+
+METRICS.add_sample("pool_size", "gauge", "Conversion worker processes.", lambda: POOL.size)
+METRICS.add_sample("pool_active", "gauge", "Conversions running or queued in the worker pool.", lambda: POOL.active)
+METRICS.add_sample("pool_queue_depth", "gauge", "Conversions waiting for a free worker.", lambda: POOL.queue_depth)
+METRICS.add_sample("cache_hits_total", "counter", "Result cache hits.", lambda: RESULTS.hits)
+METRICS.add_sample("cache_misses_total", "counter", "Result cache misses.", lambda: RESULTS.misses)
+METRICS.add_sample("cache_not_modified_total", "counter", "304 responses from ETag matches.", lambda: RESULTS.not_modified)
+METRICS.add_sample("cache_evictions_total", "counter", "Result cache evictions.", lambda: RESULTS.evictions)
+METRICS.add_sample("cache_bytes", "gauge", "Result cache size.", lambda: RESULTS.size)
+METRICS.add_sample("cache_hit_ratio", "gauge", "Result cache hit rate.", lambda: RESULTS.stats()["hit_rate"])
+if SHARED_CACHE is not None:
+    METRICS.add_sample("shared_cache_hits_total", "counter", "Shared cache hits in this process.", lambda: SHARED_CACHE.hits)
+    METRICS.add_sample("shared_cache_misses_total", "counter", "Shared cache misses in this process.", lambda: SHARED_CACHE.misses)
+    METRICS.add_sample("shared_cache_evictions_total", "counter", "Shared cache evictions by this process.", lambda: SHARED_CACHE.evictions)
+METRICS.add_sample("live_sessions", "gauge", "Open live-preview WebSocket sessions.", lambda: len(LIVE_SESSIONS))
+METRICS.add_sample("jobs_active", "gauge", "Batch jobs queued or running.", JOBS.active)
+METRICS.add_sample("admission_active", "gauge", "Admitted requests holding a conversion slot.", lambda: ADMISSION.active)
+METRICS.add_sample("admission_waiting", "gauge", "Requests waiting for a conversion slot.", lambda: ADMISSION.waiting)
+METRICS.add_sample("admission_rejected_busy_total", "counter", "Requests rejected with 503.", lambda: ADMISSION.rejected[503])
+METRICS.add_sample("admission_rejected_rate_total", "counter", "Requests rejected with 429.", lambda: ADMISSION.rejected[429])
+
+
+@app.on_event("startup")
+async def start_pool():
+    POOL.start()
+    if BrowserPool.available():
+        try:
+            await BROWSERS.start()
+        except Exception as e:  # e.g. `playwright install chromium` not run yet
+            logger.warning("Browser pool not started: %s", e)
+
+
+@app.on_event("shutdown")
+async def stop_pool():
+    POOL.close()
+    await FETCHER.close()
+    await BROWSERS.close()
+    await asyncio.to_thread(JOBS.close)
+    if SHARED_CACHE is not None:
+        SHARED_CACHE.close()
+
+
+async def cached_result(key: str) -> Optional[str]:
+    """Look a result up in RESULTS, then in the shared cache (promoting hits to RESULTS)."""
+    result = RESULTS.get(key)
+    if result is None and SHARED_CACHE is not None:
+        result = await asyncio.to_thread(SHARED_CACHE.get, key)
+        if result is not None:
+            RESULTS.put(key, result)
+    return result
+
+
+async def store_result(key: str, result: str) -> None:
+    RESULTS.put(key, result)
+    if SHARED_CACHE is not None:
+        await asyncio.to_thread(SHARED_CACHE.put, key, result)
+
+
+async def fetch_cached(url: str, timeout: Optional[float], proxy: Optional[str]) -> str:
+    """FETCHER.fetch_text through the shared cache; pages are kept for FETCH_CACHE_TTL seconds."""
+    if SHARED_CACHE is None or FETCH_CACHE_TTL <= 0:
+        return await FETCHER.fetch_text(url, timeout=timeout, proxy=proxy)
+    key = "fetch:" + cache_key(url, "fetch", proxy=proxy)
+    content = await asyncio.to_thread(SHARED_CACHE.get, key)
+    if content is None:
+        content = await FETCHER.fetch_text(url, timeout=timeout, proxy=proxy)
+        await asyncio.to_thread(SHARED_CACHE.put, key, content, FETCH_CACHE_TTL)
+    return content
+
+
+async def run_conversion(content: str, target: str, **options) -> str:
+    """Convert in the worker pool; a conversion over the per-request timeout becomes a 504."""
+    try:
+        with timed("convert"):
+            return await POOL.convert(content, target, **options)
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
 class ConvertRequest(BaseModel):
     content: str
     type: str # 'html' or 'md'
@@ -47,7 +214,7 @@ class BatchRequest(BaseModel):
     path: str
     recursive: bool = False
     output_dir: Optional[str] = None
-    enable_backup: bool = True
+    enable_backup: bool = True  # accepted for older clients; outputs never overwrite sources
     base_url: Optional[str] = None
     rewrite_paths: bool = False
     drop_unknown_tags: bool = False
@@ -76,36 +243,69 @@ async def read_root():
     return {"status": "ok", "message": "Converter API is running"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition."""
+    return Response(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/health")
 async def health():
     return {
         "status": "ok",
         "features": get_feature_status(),
+        "cache": RESULTS.stats(),
+        "shared_cache": await asyncio.to_thread(SHARED_CACHE.stats) if SHARED_CACHE is not None else None,
     }
 
 @app.post("/api/convert/text")
-async def convert_text(request: ConvertRequest):
+async def convert_text(request: ConvertRequest, http_request: Request):
+    """
+    Conversion is deterministic, so the ETag is a hash of the inputs: a matching
+    If-None-Match gets a 304 without converting, and repeats are served from
+    RESULTS or, when another worker process converted it, from SHARED_CACHE.
+    """
     try:
         if request.type == 'html':
-            result = Converter.html_to_markdown(
-                request.content,
+            target = "md"
+            options = dict(
                 base_url=request.base_url,
                 rewrite_paths=request.rewrite_paths,
                 drop_unknown_tags=request.drop_unknown_tags,
             )
-            return {"result": result}
         elif request.type == 'md':
-            result = Converter.markdown_to_html(
-                request.content,
-                base_url=request.base_url,
-                rewrite_paths=request.rewrite_paths,
-            )
-            return {"result": result}
+            target = "html"
+            options = dict(base_url=request.base_url, rewrite_paths=request.rewrite_paths)
         else:
             raise HTTPException(status_code=400, detail="Invalid type. Use 'html' or 'md'.")
+
+        key = cache_key(request.content, target, **options)
+        headers = {"ETag": f'"{key}"', "Cache-Control": "no-cache"}
+        if etag_matches(http_request.headers.get("if-none-match"), headers["ETag"]):
+            RESULTS.record_not_modified()
+            return Response(status_code=304, headers=headers)
+        with timed("cache"):
+            result = await cached_result(key)
+        if result is None:
+            result = await run_conversion(request.content, target, **options)
+            await store_result(key, result)
+        return JSONResponse({"result": result}, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _close_and_remove(f, path: Path) -> None:
+    f.close()
+    path.unlink(missing_ok=True)
+
+
+def _upload_timeout(size_mb: float) -> Optional[float]:
+    if POOL.timeout is None:
+        return None
+    return max(POOL.timeout, size_mb * UPLOAD_SECONDS_PER_MB)
+
+
 @app.post("/api/convert/file")
 async def convert_file(
     file: UploadFile = File(...),
@@ -113,57 +313,312 @@ async def convert_file(
     base_url: Optional[str] = Body(default=None),
     rewrite_paths: bool = Body(default=False),
 ):
+    """
+    Small uploads are read whole and converted like /api/convert/text. Larger
+    ones (the multipart parser has already spooled them to disk) are copied to
+    TEMP_DIR and decoded and converted chunk by chunk in a pool worker, under
+    the pool's memory limit and a timeout scaled to the upload size, and the
+    JSON response is streamed from the result file.
+    """
     try:
-        content = (await file.read()).decode('utf-8')
-        filename = file.filename
-        stem = Path(filename).stem
-        
+        stem = Path(file.filename).stem
         if target_format == 'md':
-            result = Converter.html_to_markdown(content, base_url=base_url, rewrite_paths=rewrite_paths)
             output_filename = f"{stem}.md"
-            media_type = "text/markdown"
         elif target_format == 'html':
-            result = Converter.markdown_to_html(content, base_url=base_url, rewrite_paths=rewrite_paths)
             output_filename = f"{stem}.html"
-            media_type = "text/html"
         else:
             raise HTTPException(status_code=400, detail="Invalid target format")
-            
-        return JSONResponse({
-            "filename": output_filename,
-            "content": result
-        })
+
+        head = await file.read(UPLOAD_SPOOL_BYTES + 1)
+        if len(head) <= UPLOAD_SPOOL_BYTES:
+            content = head.decode('utf-8')
+            result = await run_conversion(content, target_format, base_url=base_url, rewrite_paths=rewrite_paths)
+            return JSONResponse({
+                "filename": output_filename,
+                "content": result
+            })
+
+        # the worker reads the upload from a named file and writes the result to another
+        await file.seek(0)
+        fd, name = tempfile.mkstemp(suffix=".upload", dir=TEMP_DIR)
+        source, converted = Path(name), Path(name + ".out")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                await asyncio.to_thread(shutil.copyfileobj, file.file, f, 1024 * 1024)
+                size_mb = f.tell() / (1024 * 1024)
+            with timed("convert"):
+                await POOL.run_within(
+                    _upload_timeout(size_mb),
+                    convert_upload_file,
+                    str(source),
+                    str(converted),
+                    target_format,
+                    base_url=base_url,
+                    rewrite_paths=rewrite_paths,
+                )
+            result = open(converted, encoding="utf-8", newline="")
+        except BaseException:
+            converted.unlink(missing_ok=True)
+            raise
+        finally:
+            source.unlink(missing_ok=True)
+        return StreamingResponse(
+            iter_json_with_text({"filename": output_filename}, "content", result),
+            media_type="application/json",
+            background=BackgroundTask(_close_and_remove, result, converted),
+        )
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/batch")
-async def batch_convert(request: BatchRequest):
+@app.post("/api/convert/stream")
+async def convert_stream(
+    request: Request,
+    type: str = Query("html"),
+    base_url: Optional[str] = Query(default=None),
+    rewrite_paths: bool = Query(default=False),
+    drop_unknown_tags: bool = Query(default=False),
+):
+    """
+    Convert a raw (optionally chunked) UTF-8 request body and stream the result
+    back block by block, so neither side holds the whole document.
+    Known limitation: the converter keeps state between chunks, so it runs on
+    threads in this process, not in the worker pool. It shares the GIL with the
+    event loop, and there is no pool timeout or memory limit. Instead, time spent
+    converting is capped at CONVERTER_STREAM_TIMEOUT per request. Past that the
+    response is cut off, because the status has already been sent. The thread
+    running at that moment cannot be killed and finishes its chunk.
+    """
+    if type == 'html':
+        converter = HTMLToMarkdownStream(
+            base_url=base_url, rewrite_paths=rewrite_paths, drop_unknown_tags=drop_unknown_tags
+        )
+        media_type = "text/markdown; charset=utf-8"
+    elif type == 'md':
+        converter = MarkdownToHTMLStream(base_url=base_url, rewrite_paths=rewrite_paths)
+        media_type = "text/html; charset=utf-8"
+    else:
+        raise HTTPException(status_code=400, detail="Invalid type. Use 'html' or 'md'.")
+
+    spent = 0.0
+
+    async def convert(fn, *args) -> str:
+        # stream state lives here, so chunks convert on a thread rather than the process pool
+        nonlocal spent
+        started = time.perf_counter()
+        try:
+            if STREAM_TIMEOUT is None:
+                return await asyncio.to_thread(fn, *args)
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), max(0.0, STREAM_TIMEOUT - spent))
+        except asyncio.TimeoutError:
+            logger.warning("stream conversion exceeded %gs, aborting the response", STREAM_TIMEOUT)
+            raise TimeoutError(f"Stream conversion timed out after {STREAM_TIMEOUT:g}s") from None
+        finally:
+            spent += time.perf_counter() - started
+
+    async def generate():
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        async for chunk in request.stream():
+            text = decoder.decode(chunk)
+            if text:
+                out = await convert(converter.feed, text)
+                if out:
+                    yield out
+        out = await convert(converter.feed, decoder.decode(b"", final=True))
+        yield out + await convert(converter.close)
+
+    return StreamingResponse(generate(), media_type=media_type)
+
+
+@app.websocket("/api/live")
+async def live_convert(websocket: WebSocket):
+    """
+    Live Markdown preview, one LiveSession per connection. The client sends
+    {"type": "init", "content", "base_url", "rewrite_paths"} once, then
+    {"type": "edit", "version", "changes": [{"from", "to", "insert"}]} per edit.
+    Each gets {"type": "patch", "version", "start", "delete", "blocks"}: replace
+    `delete` preview blocks at `start` with the HTML `blocks`. Bad messages get
+    {"type": "error", "detail", "version", "stale"}; after a stale edit the
+    client sends init again.
+    """
+    await websocket.accept()
+    session = None
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+                kind = message.get("type") if isinstance(message, dict) else None
+                if kind == "init":
+                    if session is not None:
+                        LIVE_SESSIONS.discard(session)
+                    session = LiveSession(
+                        base_url=message.get("base_url"),
+                        rewrite_paths=bool(message.get("rewrite_paths")),
+                        max_chars=LIVE_MAX_CHARS,
+                    )
+                    LIVE_SESSIONS.add(session)
+                    patch = await asyncio.to_thread(session.reset, str(message.get("content", "")))
+                elif kind == "edit" and session is not None:
+                    patch = await asyncio.to_thread(session.apply, message.get("changes"), message.get("version"))
+                else:
+                    raise ValueError("Send an init message first" if session is None else f"Unknown message type {kind!r}")
+            except (ValueError, TypeError, KeyError) as e:
+                await websocket.send_json({
+                    "type": "error",
+                    "detail": str(e),
+                    "version": session.version if session is not None else 0,
+                    "stale": isinstance(e, StaleVersion),
+                })
+                continue
+            await websocket.send_json(patch)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        LIVE_SESSIONS.discard(session)
+
+
+BULK_CHUNK = 64  # items per worker round trip
+
+
+async def _ndjson_chunks(request: Request):
+    """Split an NDJSON body into chunks of raw lines as it arrives; the workers parse them."""
+    chunk = []
+    buf = b""
+    async for data in request.stream():
+        buf += data
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                chunk.append(line.decode("utf-8", "replace"))
+                if len(chunk) >= BULK_CHUNK:
+                    yield chunk
+                    chunk = []
+    if buf.strip():
+        chunk.append(buf.decode("utf-8", "replace"))
+    if chunk:
+        yield chunk
+
+
+async def _list_chunks(items: list):
+    for i in range(0, len(items), BULK_CHUNK):
+        yield items[i:i + BULK_CHUNK]
+
+
+def _item_error(item, error: BaseException) -> dict:
+    return {"id": item.get("id") if isinstance(item, dict) else None, "error": str(error) or type(error).__name__}
+
+
+async def _convert_chunk(start: int, chunk: list):
+    """
+    Convert a chunk in one worker round trip. If the chunk times out or its
+    worker fails, each item is retried on its own so only the items that
+    fail again become error entries.
+    """
+    try:
+        with timed("convert"):
+            return start, await POOL.run(convert_items, chunk)
+    except Exception as e:
+        if len(chunk) == 1:
+            return start, [_item_error(chunk[0], e)]
+    with timed("convert"):
+        retried = await asyncio.gather(*(POOL.run(convert_items, [item]) for item in chunk), return_exceptions=True)
+    return start, [
+        _item_error(item, res) if isinstance(res, BaseException) else res[0] for item, res in zip(chunk, retried)
+    ]
+
+
+async def _run_bulk(chunks):
+    """Yield (index of first item, results) per chunk as chunks finish, with a bounded number in flight."""
+    pending = set()
+    start = 0
+    try:
+        async for chunk in chunks:
+            pending.add(asyncio.ensure_future(_convert_chunk(start, chunk)))
+            start += len(chunk)
+            if len(pending) >= POOL.size * 2:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@app.post("/api/convert/bulk")
+async def convert_bulk(request: Request, stream: bool = Query(default=False)):
+    """
+    Convert many {id, content, type, options} items in one request. The body is
+    a JSON array, or NDJSON with Content-Type application/x-ndjson. Items are
+    converted in chunks on the worker pool. The response is {"results": [...]}
+    in input order, or with stream=true NDJSON lines ({"index", "id", ...}) in
+    completion order.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        chunks = _ndjson_chunks(request)
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of items or an NDJSON body")
+        chunks = _list_chunks(items)
+
+    if stream:
+        async def generate():
+            async for start, results in _run_bulk(chunks):
+                yield "".join(
+                    json.dumps({"index": start + i, **res}, ensure_ascii=False) + "\n" for i, res in enumerate(results)
+                )
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    by_start = {}
+    async for start, results in _run_bulk(chunks):
+        by_start[start] = results
+    return {"results": [res for start in sorted(by_start) for res in by_start[start]]}
+
+
+def _batch_files(request: BatchRequest) -> List[str]:
     directory = Path(request.path)
     if not directory.exists() or not directory.is_dir():
         raise HTTPException(status_code=400, detail="Directory not found")
-    
+    extensions = ['.html', '.md']
+    if request.recursive:
+        files = [p for p in directory.rglob("*") if p.is_file()]
+    else:
+        files = [p for p in directory.glob("*") if p.is_file()]
+    return [str(p) for p in files if p.suffix.lower() in extensions]
+
+
+def _batch_options(request: BatchRequest) -> dict:
+    return dict(
+        target_format="auto",
+        output_dir=request.output_dir,
+        base_dir=Path(request.path),
+        base_url=request.base_url,
+        rewrite_paths=request.rewrite_paths,
+        drop_unknown_tags=request.drop_unknown_tags,
+    )
+
+
+@app.post("/api/batch")
+async def batch_convert(request: BatchRequest):
+    """Convert a directory within the request. Prefer /api/jobs for large trees."""
     converted_count = 0
     errors = []
     
     try:
-        extensions = ['.html', '.md']
-        files = []
-        if request.recursive:
-            files = [p for p in directory.rglob("*") if p.is_file()]
-        else:
-            files = [p for p in directory.glob("*") if p.is_file()]
-
-        selected_files = [str(p) for p in files if p.suffix.lower() in extensions]
-        results = manager.batch_convert(
-            selected_files,
-            target_format="auto",
-            enable_backup=request.enable_backup,
-            output_dir=request.output_dir,
-            base_dir=directory,
-            base_url=request.base_url,
-            rewrite_paths=request.rewrite_paths,
-            drop_unknown_tags=request.drop_unknown_tags,
-        )
+        selected_files = await asyncio.to_thread(_batch_files, request)
+        results = await asyncio.to_thread(manager.batch_convert, selected_files, **_batch_options(request))
 
         for r in results:
             if r.success:
@@ -175,37 +630,96 @@ async def batch_convert(request: BatchRequest):
             "converted": converted_count,
             "errors": errors
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _get_job(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(request: BatchRequest):
+    """Queue a directory conversion and return its id straight away."""
+    files = await asyncio.to_thread(_batch_files, request)
+    job = JOBS.submit(files, **_batch_options(request))
+    return job.describe()
+
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str):
+    return _get_job(job_id).describe()
+
+
+@app.get("/api/jobs/{job_id}/progress")
+async def job_progress(job_id: str):
+    return _get_job(job_id).describe_progress()
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    job = JOBS.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.describe()
+
+
+@app.get("/api/jobs/{job_id}/results")
+async def job_results(job_id: str, since: int = Query(default=0, ge=0)):
+    """
+    Stream per-file results as NDJSON in completion order until the job finishes.
+    `since` skips results a reconnecting client has already seen.
+    """
+    job = _get_job(job_id)
+
+    async def generate():
+        sent = since
+        while True:
+            finished = job.is_finished  # read before the results so none are missed
+            batch = job.results[sent:]
+            if batch:
+                sent += len(batch)
+                yield "".join(json.dumps(result_entry(i, res), ensure_ascii=False) + "\n" for i, res in batch)
+            elif finished:
+                return
+            else:
+                await asyncio.sleep(0.25)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @app.post("/api/convert/url")
 async def convert_url(request: URLRequest):
     try:
         content = ""
         if request.dynamic:
-            try:
-                from playwright.sync_api import sync_playwright  # Optional dependency
-            except Exception as e:
+            if not BrowserPool.available():
                 raise HTTPException(
                     status_code=501,
                     detail="Dynamic rendering requires playwright. Install with `pip install playwright` and run `playwright install chromium`."
-                ) from e
-
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(request.url, wait_until="networkidle")
-                page.wait_for_timeout(request.wait_ms)
-                content = page.content()
-                browser.close()
+                )
+            try:
+                content = await BROWSERS.render(
+                    request.url, wait_ms=request.wait_ms, proxy=request.proxy, timeout=request.timeout
+                )
+            except TimeoutError as e:
+                raise HTTPException(status_code=504, detail=str(e))
         else:
-            proxies = {"http": request.proxy, "https": request.proxy} if request.proxy else None
-            resp = requests.get(request.url, timeout=request.timeout, proxies=proxies)
-            resp.raise_for_status()
-            content = resp.text
-
-        if request.main_only:
+            try:
+                content = await fetch_cached(request.url, request.timeout, request.proxy)
+            except TimeoutError as e:
+                raise HTTPException(status_code=504, detail=str(e))
+            except FetchError as e:
+                raise HTTPException(status_code=502, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        if request.main_only and has_module("readability"):
             try:
                 from readability import Document  # type: ignore
                 doc = Document(content)
@@ -215,7 +729,7 @@ async def convert_url(request: URLRequest):
                 pass
 
         if request.target_format == "md":
-            result = Converter.html_to_markdown(content)
+            result = await run_conversion(content, "md")
             media_type = "text/markdown"
             filename = "converted.md"
         elif request.target_format == "html":
@@ -226,6 +740,8 @@ async def convert_url(request: URLRequest):
             raise HTTPException(status_code=400, detail="Invalid target_format, use 'md' or 'html'")
 
         return JSONResponse({"filename": filename, "content": result}, media_type=media_type)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -238,15 +754,15 @@ async def convert_clipboard(request: ClipboardRequest):
         except ImportError:
             from core.clipboard_utils import read_clipboard_text
         prefer_html = request.type == 'html'
-        text = read_clipboard_text(prefer_html=prefer_html)
+        text = await asyncio.to_thread(read_clipboard_text, prefer_html=prefer_html)
         if not text:
             raise HTTPException(status_code=400, detail="Clipboard is empty")
 
         if request.type == 'html':
-            result = Converter.html_to_markdown(text)
+            result = await run_conversion(text, "md")
             media_type = "text/markdown"
         elif request.type == 'md':
-            result = Converter.markdown_to_html(text)
+            result = await run_conversion(text, "html")
             media_type = "text/html"
         else:
             raise HTTPException(status_code=400, detail="Invalid type. Use 'html' or 'md'.")
@@ -266,18 +782,42 @@ async def export_content_api(request: ExportRequest):
         if request.export not in ("pdf", "docx"):
             raise HTTPException(status_code=400, detail="Invalid export. Use 'pdf' or 'docx'.")
 
-        output_path = TEMP_DIR / f"{request.filename}.{request.export}"
-        export_path = export_content(
-            request.content,
-            request.type,
-            request.export,
-            output_path,
-            css_text=request.css,
-        )
-        return FileResponse(
-            export_path,
-            filename=export_path.name,
-            media_type="application/octet-stream",
+        filename = f"{Path(request.filename).name or 'export'}.{request.export}"
+        # the worker fills the spill file only for large exports; it is created here so a
+        # killed worker never leaves one behind
+        fd, name = tempfile.mkstemp(suffix=f".{request.export}", dir=TEMP_DIR)
+        os.close(fd)
+        spill = Path(name)
+        try:
+            with timed("export"):
+                exported = await POOL.run(
+                    export_content_spooled,
+                    request.content,
+                    request.type,
+                    request.export,
+                    spill,
+                    EXPORT_SPILL_BYTES,
+                    css_text=request.css,
+                )
+        except TimeoutError as e:
+            spill.unlink(missing_ok=True)
+            raise HTTPException(status_code=504, detail=str(e))
+        except BaseException:
+            spill.unlink(missing_ok=True)
+            raise
+        media_type = EXPORT_MEDIA_TYPES[request.export]
+        if isinstance(exported, Path):
+            return FileResponse(
+                exported,
+                filename=filename,
+                media_type=media_type,
+                background=BackgroundTask(os.unlink, exported),
+            )
+        spill.unlink(missing_ok=True)
+        return Response(
+            exported,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}"},
         )
     except ExportError as e:
         raise HTTPException(status_code=501, detail=str(e))
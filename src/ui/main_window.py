@@ -18,7 +18,7 @@ except Exception:
     from PyQt5.QtWidgets import QTextBrowser as QWebEngineView
     WEB_ENGINE_AVAILABLE = False
 from pathlib import Path
-from src.core.manager import batch_convert
+from src.core.manager import batch_convert, BatchControl
 from src.core.settings import load_settings, save_settings
 from src.core.exporter import export_content, ExportError
 from src.core.i18n import t, set_language, get_language
@@ -28,6 +28,7 @@ from .styles import get_style
 
 class ConversionWorker(QThread):
     progress = pyqtSignal(int, int, str)
+    stats = pyqtSignal(object)
     finished = pyqtSignal(list)
 
     def __init__(self, files, target_format, output_dir=None):
@@ -37,12 +38,18 @@ class ConversionWorker(QThread):
         self.output_dir = output_dir
         self.cancel_requested = False
         self.pause_requested = False
+        self.control = BatchControl()
 
     def request_cancel(self):
         self.cancel_requested = True
+        self.control.cancel()
 
     def request_pause(self, pause: bool):
         self.pause_requested = pause
+        if pause:
+            self.control.pause()
+        else:
+            self.control.resume()
 
     def run(self):
         base_dir = None
@@ -61,8 +68,9 @@ class ConversionWorker(QThread):
             lambda current, total, name: self.progress.emit(current, total, name),
             output_dir=self.output_dir,
             base_dir=base_dir,
-            cancel_callback=lambda: self.cancel_requested,
-            pause_callback=lambda: self.pause_requested,
+            control=self.control,
+            stats_callback=self.stats.emit,
+            max_workers="auto",
         )
         self.finished.emit(results)
 
@@ -573,6 +581,7 @@ class MainWindow(QMainWindow):
         
         self.worker = ConversionWorker(files, target_format, output_dir=self.output_dir)
         self.worker.progress.connect(self.update_progress)
+        self.worker.stats.connect(self.update_stats)
         self.worker.finished.connect(self.conversion_finished)
         self.worker.start()
 
@@ -593,9 +602,12 @@ class MainWindow(QMainWindow):
         self.log("Paused" if not paused else "Resumed")
         
     def update_progress(self, current, total, filename):
-        percentage = int((current / total) * 100)
-        self.progress_bar.setValue(percentage)
         self.status_label.setText(f"Processing: {os.path.basename(filename)}")
+
+    def update_stats(self, progress):
+        self.progress_bar.setValue(progress.percent)
+        if not self.worker.pause_requested:
+            self.status_label.setText(progress.describe())
         
     def conversion_finished(self, results):
         self.btn_convert.setEnabled(True)
@@ -607,7 +619,7 @@ class MainWindow(QMainWindow):
         
         success_count = sum(1 for r in results if r.success)
         failed = [r for r in results if not r.success]
-        cancelled = any(r.message == "Cancelled" for r in results)
+        cancelled = self.worker.control.cancelled or any(r.message == "Cancelled" for r in results)
         
         msg = f"Completed!\n\n✅ Success: {success_count}\n❌ Failed: {len(failed)}"
         if failed:
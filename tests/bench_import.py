@@ -0,0 +1,79 @@
+"""
+Import-time budget check for the API server.
+Imports the module in a fresh interpreter with -X importtime, prints the
+heaviest imports, and exits non-zero when the import takes longer than
+--budget-ms or pulls in a module that must only be loaded on first use.
+
+    python tests/bench_import.py --budget-ms 1000
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# optional or heavy dependencies that must not be imported at server start
+LAZY_MODULES = (
+    "PyQt5",
+    "weasyprint",
+    "playwright",
+    "readability",
+    "requests",
+    "httpx",
+    "pyperclip",
+    "fpdf",
+    "docx",
+    "bs4",
+    "lxml",
+    "win32clipboard",
+)
+
+
+def measure(module: str) -> dict:
+    """Return {imported module: (self us, cumulative us)} for one cold import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N cold imports")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.repeat))]
+    best = min(runs, key=lambda t: t[args.module][1])
+    total_ms = best[args.module][1] / 1000
+    print(f"import {args.module}: {total_ms:.1f} ms (best of {len(runs)}, budget {args.budget_ms:g} ms)")
+    for name, (_, cumulative) in sorted(best.items(), key=lambda kv: kv[1][1], reverse=True)[1:args.top + 1]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    eager = sorted({name.split(".")[0] for name in best} & set(LAZY_MODULES))
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup, should be lazy: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms is over the {args.budget_ms:g} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
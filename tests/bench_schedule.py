@@ -0,0 +1,65 @@
+"""
+Benchmark batch_convert scheduling on a skewed corpus.
+Many small files are listed first and a few large ones last, the worst case
+for listing order. Runs in worker-process mode so workers really run in parallel.
+
+    python tests/bench_schedule.py --workers 4
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from core import manager
+
+PAGE = "<h2>Section</h2><p>Some <b>bold</b> text with a <a href='x.html'>link</a>.</p><ul><li>one</li><li>two</li></ul>\n"
+
+
+def build_corpus(root: Path, small: int, large: int, large_kb: int) -> list:
+    files = []
+    for i in range(small):
+        p = root / f"small_{i:05d}.html"
+        p.write_text(PAGE * 4, encoding="utf-8")
+        files.append(str(p))
+    repeat = large_kb * 1024 // len(PAGE)
+    for i in range(large):
+        p = root / f"large_{i:03d}.html"
+        p.write_text(PAGE * repeat, encoding="utf-8")
+        files.append(str(p))
+    return files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--small", type=int, default=400)
+    parser.add_argument("--large", type=int, default=4)
+    parser.add_argument("--large-kb", type=int, default=2048)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        src.mkdir()
+        files = build_corpus(src, args.small, args.large, args.large_kb)
+        print(f"corpus: {args.small} x small, {args.large} x {args.large_kb} KB, {args.workers} workers")
+        for schedule in manager.SCHEDULES:
+            start = time.perf_counter()
+            results = manager.batch_convert(
+                files,
+                output_dir=Path(tmp) / schedule,
+                base_dir=src,
+                max_workers=args.workers,
+                file_timeout=3600,
+                schedule=schedule,
+            )
+            elapsed = time.perf_counter() - start
+            ok = sum(1 for r in results if r.success)
+            print(f"{schedule:>14}: {elapsed:7.2f}s  ({ok}/{len(files)} ok)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
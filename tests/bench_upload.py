@@ -0,0 +1,122 @@
+"""
+Memory benchmark for large file uploads.
+Converts a generated HTML file (100 MB by default) in a fresh interpreter per
+mode and reports peak RSS above the interpreter baseline, plus wall time.
+Modes: 'read' is the old /api/convert/file path (read the whole upload,
+decode, convert). 'endpoint' is what /api/convert/file does now for large
+uploads: copy the spooled upload to a temp file, run convert_upload_file in a
+ConversionPool worker process, then stream the JSON response from the result
+file. For 'endpoint' the worker's peak RSS (absolute, it is a fresh process)
+is reported too, and the time includes the copy, the worker round trip and
+serializing the response.
+
+    python tests/bench_upload.py --size-mb 100
+"""
+import argparse
+import asyncio
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+BLOCK = (
+    '<h2>Section</h2><p>Some <strong>bold</strong> text &amp; a <a href="/x">link</a> ü中</p>'
+    "<ul><li>one</li><li>two</li></ul>"
+    "<table><tr><th>a</th><th>b</th></tr><tr><td>1</td><td>2</td></tr></table>\n"
+)
+
+
+def write_upload(path: Path, size_mb: float) -> int:
+    block = BLOCK.encode("utf-8")
+    count = int(size_mb * 1024 * 1024) // len(block) + 1
+    with open(path, "wb") as f:
+        f.write(b"<html><body>")
+        for _ in range(count):
+            f.write(block)
+        f.write(b"</body></html>")
+    return path.stat().st_size
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    return resource.getrusage(who).ru_maxrss / 1024  # KiB on Linux
+
+
+def run_endpoint(path: Path) -> int:
+    """The large-upload branch of /api/convert/file, minus HTTP."""
+    from core.pool import ConversionPool
+    from core.upload import convert_upload_file, iter_json_with_text
+
+    pool = ConversionPool(size=1, timeout=None)
+    fd, name = tempfile.mkstemp(suffix=".upload", dir=path.parent)
+    source, converted = Path(name), Path(name + ".out")
+    try:
+        with open(path, "rb") as upload, os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(upload, f, 1024 * 1024)
+        asyncio.run(pool.run_within(None, convert_upload_file, str(source), str(converted), "md"))
+        size = 0
+        with open(converted, encoding="utf-8", newline="") as result:
+            for piece in iter_json_with_text({"filename": "upload.md"}, "content", result):
+                size += len(piece)
+        return size
+    finally:
+        pool.close()
+        source.unlink(missing_ok=True)
+        converted.unlink(missing_ok=True)
+
+
+def child(mode: str, path: Path) -> None:
+    from core.html_to_md import html_to_markdown
+
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    worker = 0.0
+    if mode == "read":
+        with open(path, "rb") as f:
+            result = html_to_markdown(f.read().decode("utf-8"))
+        size = len(result.encode("utf-8"))
+    else:
+        size = run_endpoint(path)
+        worker = peak_rss_mb(resource.RUSAGE_CHILDREN)
+    print(f"{peak_rss_mb() - baseline:.1f} {worker:.1f} {time.perf_counter() - started:.2f} {size}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=100.0)
+    parser.add_argument("--modes", default="endpoint,read")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], Path(args.child[1]))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "upload.html"
+        size = write_upload(path, args.size_mb)
+        print(f"upload: {size / 1024 / 1024:.1f} MB")
+        for mode in args.modes.split(","):
+            proc = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(path)],
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{mode:>8}: failed: {proc.stderr.strip().splitlines()[-1]}")
+                continue
+            rss, worker, seconds, out_size = proc.stdout.split()
+            line = f"{mode:>8}: peak RSS +{float(rss):8.1f} MB"
+            if float(worker):
+                line += f"  worker {float(worker):8.1f} MB"
+            print(f"{line}  {float(seconds):7.2f} s  output {int(out_size) / 1024 / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
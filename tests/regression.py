@@ -1,10 +1,35 @@
+import asyncio
+import functools
+import http.server
+import multiprocessing
+import random
 import sys
+import tarfile
+import tempfile
+import time
+import threading
+import zipfile
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from core.html_to_md import html_to_markdown
-from core.md_to_html import markdown_to_html
+from core.html_to_md import html_to_markdown, HTMLToMarkdownStream
+from core.md_to_html import markdown_to_html, MarkdownToHTMLStream
+from core import adaptive, manager
+from core.bulk import iter_bulk, convert_items
+from core.pool import ConversionPool
+from core.browser_pool import BrowserPool
+from core.exporter import export_content_spooled, export_docx_bytes, export_pdf_bytes
+from core.feature_flags import has_module
+from core.http_fetch import AsyncFetcher
+from core.jobs import JobQueue
+from core.result_cache import ResultCache, cache_key, etag_matches
+from core.metrics import Metrics, MetricsMiddleware, timed
+from core.admission import AdmissionControl, AdmissionMiddleware
+from core.shared_cache import SharedCache
+from core.live import LiveSession, StaleVersion
+from core.archive_io import ArchiveWriter
+from core.upload import convert_upload, convert_upload_file, iter_json_with_text
 
 
 def test_html_links():
@@ -69,6 +94,619 @@ def test_base_url_resolution():
     assert 'https://example.com/images/a.png' in html
 
 
+def test_batch_pause_blocks_dispatch():
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(6):
+            p = Path(tmp) / f"page{i}.html"
+            p.write_text(f"<p>page {i}</p>", encoding="utf-8")
+            files.append(str(p))
+        control = manager.BatchControl()
+        control.pause()
+        out = {}
+        t = threading.Thread(target=lambda: out.setdefault("results", manager.batch_convert(files, max_workers=3, control=control)))
+        t.start()
+        t.join(0.3)
+        assert t.is_alive()
+        assert not list(Path(tmp).glob("*.md"))
+        control.cancel()
+        t.join(2)
+        assert not t.is_alive()
+        assert out["results"] == []
+
+
+def test_batch_stats_on_completion():
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(4):
+            p = Path(tmp) / f"page{i}.html"
+            p.write_text(f"<h1>Title {i}</h1>" * (i + 1), encoding="utf-8")
+            files.append(str(p))
+        files.append(str(Path(tmp) / "missing.html"))
+        seen = []
+        manager.batch_convert(files, max_workers=2, stats_callback=seen.append)
+        last = seen[-1]
+        assert [s.completed for s in seen] == [1, 2, 3, 4, 5]
+        assert last.succeeded == 4 and last.failed == 1
+        assert last.bytes_in == sum(Path(f).stat().st_size for f in files[:4])
+        assert last.bytes_out > 0
+        assert last.eta == 0.0
+
+
+def test_buffered_writer_is_atomic():
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = manager.OutputWriter(buffer_small=True, buffer_limit=1 << 20)
+        target = Path(tmp) / "a" / "b" / "out.md"
+        assert writer.write_text(target, "# hi") == 4
+        assert not target.exists()
+        writer.flush()
+        assert target.read_text(encoding="utf-8") == "# hi"
+        assert [p.name for p in target.parent.iterdir()] == ["out.md"]
+        assert target.parent in writer._created_dirs
+        plain = Path(tmp) / "plain.md"
+        plain.write_text("# hi", encoding="utf-8")
+        assert target.stat().st_mode & 0o777 == plain.stat().st_mode & 0o777
+
+
+def test_batch_resume_skips_journaled_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(3):
+            p = Path(tmp) / f"page{i}.html"
+            p.write_text(f"<p>page {i}</p>", encoding="utf-8")
+            files.append(str(p))
+        journal = Path(tmp) / "journal.jsonl"
+        manager.batch_convert(files[:2], journal_path=journal)
+        started = []
+        results = manager.batch_convert(
+            files,
+            progress_callback=lambda i, total, name: started.append(name),
+            journal_path=journal,
+            resume=True,
+        )
+        assert started == ["page2.html"]
+        assert [r.success for r in results] == [True, True, True]
+        assert len(journal.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_batch_file_timeout_isolates_slow_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        slow = Path(tmp) / "slow.md"
+        slow.write_text("~~a " * 40000, encoding="utf-8")  # quadratic strikethrough scan
+        fast = Path(tmp) / "fast.md"
+        fast.write_text("# ok", encoding="utf-8")
+        results = manager.batch_convert([str(slow), str(fast)], max_workers=2, file_timeout=1.0)
+        assert not results[0].success and results[0].error_code == "timeout"
+        assert results[1].success
+        assert (Path(tmp) / "fast.html").read_text(encoding="utf-8") == "<h1>ok</h1>"
+
+
+def test_batch_dedupe_converts_identical_files_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for name in ("a", "b", "c"):
+            p = Path(tmp) / "src" / name / "index.html"
+            p.parent.mkdir(parents=True)
+            p.write_text("<h1>Same</h1>" if name != "c" else "<h1>Other</h1>", encoding="utf-8")
+            files.append(str(p))
+        started = []
+        out = Path(tmp) / "out"
+        results = manager.batch_convert(
+            files,
+            progress_callback=lambda i, total, name: started.append(i),
+            output_dir=out,
+            base_dir=Path(tmp) / "src",
+            dedupe=True,
+            hardlink_duplicates=True,
+        )
+        assert started == [1, 3]
+        assert all(r.success for r in results)
+        assert results[1].duplicate_of == files[0]
+        assert (out / "b" / "index.md").read_text(encoding="utf-8") == "# Same"
+        assert (out / "b" / "index.md").stat().st_ino == (out / "a" / "index.md").stat().st_ino
+
+        bad = [Path(tmp) / "bad1.html", Path(tmp) / "bad2.html"]
+        for p in bad:
+            p.write_bytes(b"<p>\x80</p>")
+        results = manager.batch_convert([str(p) for p in bad], output_dir=out, dedupe=True)
+        assert len(results) == 2
+        assert [r.error_code for r in results] == ["decode", "decode"]
+        assert results[1].message == results[0].message and results[1].duplicate_of == str(bad[0])
+
+
+def test_batch_largest_first_schedule():
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for name, size in (("small", 1), ("big", 50), ("mid", 10)):
+            p = Path(tmp) / f"{name}.html"
+            p.write_text("<p>x</p>" * size, encoding="utf-8")
+            files.append(str(p))
+        started = []
+        results = manager.batch_convert(
+            files, progress_callback=lambda i, total, name: started.append(name), schedule="largest-first"
+        )
+        assert started == ["big.html", "mid.html", "small.html"]
+        assert [Path(r.file_path).name for r in results] == ["small.html", "big.html", "mid.html"]
+
+
+class _FakeClock:
+    """Stands in for the time module in core.adaptive: one sample per tick, no CPU used."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def process_time(self) -> float:
+        return 0.0
+
+
+def test_adaptive_workers_settle_at_knee():
+    clock = _FakeClock()
+    real_time, adaptive.time = adaptive.time, clock
+    try:
+        auto = manager.AdaptiveWorkers(cap=8, start=2, sample_seconds=1.0)
+        for files_per_sec in (100, 180, 240, 245):
+            clock.now += 1.0
+            auto.record(files_per_sec)
+        assert auto.settled and auto.limit == 4
+        assert [limit for limit, _, _ in auto.history] == [2, 3, 4, 5]
+        clock.now += 1.0
+        auto.record(100)
+        assert not auto.settled and auto.limit == 3
+    finally:
+        adaptive.time = real_time
+
+
+def test_results_are_compact_and_summarized():
+    with tempfile.TemporaryDirectory() as tmp:
+        good = Path(tmp) / "good.html"
+        good.write_bytes("\ufeff<p>héllo</p>".encode("utf-8"))
+        legacy = Path(tmp) / "legacy.html"
+        legacy.write_bytes('<meta charset="gbk"><p>中文</p>'.encode("gbk"))
+        results = manager.batch_convert([str(good), str(legacy), str(Path(tmp) / "gone.html")])
+        assert not hasattr(results[0], "__dict__")
+        assert results[0].encoding == "utf-8-sig" and results[0].input_bytes == good.stat().st_size
+        assert results[1].encoding == "gbk" and "中文" in Path(results[1].output_path).read_text(encoding="utf-8")
+        assert results[2].error_code == "not_found"
+        summary = manager.summarize_results(results)
+        assert summary["succeeded"] == 2 and summary["error_codes"] == {"not_found": 1}
+        assert summary["output_bytes"] == sum(r.output_bytes for r in results)
+        assert 0 < summary["p50"] <= summary["max"]
+
+
+def test_convert_archive_in_memory():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "docs.zip"
+        with zipfile.ZipFile(src, "w") as zf:
+            zf.writestr("guide/intro.html", "<h1>Intro</h1>")
+            zf.writestr("guide/logo.png", b"\x89PNG")
+            zf.writestr("../evil.html", "<p>x</p>")
+        results = manager.convert_archive(src)
+        assert [r.success for r in results] == [True, False]
+        with zipfile.ZipFile(Path(tmp) / "docs_converted.zip") as zf:
+            assert sorted(zf.namelist()) == ["guide/intro.md", "guide/logo.png"]
+            assert zf.read("guide/intro.md").decode("utf-8") == "# Intro"
+        assert not (Path(tmp) / "guide").exists()
+        out = Path(tmp) / "out" / "docs.tar.gz"
+        out.parent.mkdir()
+        out.write_bytes(b"old")
+        with ArchiveWriter(out) as sink:
+            sink.write("a.md", b"# A")
+        assert out.read_bytes() != b"old" and [p.name for p in out.parent.iterdir()] == ["docs.tar.gz"]
+        try:
+            with ArchiveWriter(out) as sink:
+                sink.write("b.md", b"# B")
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert [p.name for p in out.parent.iterdir()] == ["docs.tar.gz"]
+        with tarfile.open(out) as tf:
+            assert tf.getnames() == ["a.md"]
+
+
+def test_jsonl_bulk_keeps_order():
+    lines = ['{"id": %d, "html": "<h1>T%d</h1>"}' % (i, i) for i in range(5)] + ["oops"]
+    out = list(iter_bulk(lines, chunk_size=2))
+    assert out[0] == ('{"id": 0, "markdown": "# T0"}', False)
+    assert out[4] == ('{"id": 4, "markdown": "# T4"}', False)
+    assert out[5][1] is True
+
+
+def test_conversion_pool_times_out_without_blocking():
+    async def scenario(pool):
+        slow = asyncio.ensure_future(pool.run(time.sleep, 5))
+        start = time.monotonic()
+        small = await pool.convert("<h1>T</h1>", "md")
+        assert small == "# T" and time.monotonic() - start < 1.0
+        big = await pool.convert("<p>x</p>" * 4000, "md")
+        assert big.startswith("x")
+        assert await pool.run_within(10.0, time.sleep, 1.7) is None  # longer than pool.timeout
+        try:
+            await slow
+        except TimeoutError:
+            return
+        raise AssertionError("expected a timeout")
+
+    pool = ConversionPool(size=2, timeout=1.5, inline_bytes=1024)
+    try:
+        asyncio.run(scenario(pool))
+    finally:
+        pool.close()
+
+    inline = ConversionPool(size=1, timeout=0.001, inline_bytes=1 << 20)
+    try:
+        asyncio.run(inline.convert("<p>x</p>" * 20000, "md"))
+    except TimeoutError:
+        return
+    raise AssertionError("expected the inline path to time out")
+
+
+def test_browser_pool_recycles_browsers():
+    if not BrowserPool.available():
+        return  # optional dependency
+    with tempfile.TemporaryDirectory() as tmp:
+        page = "<div id='out'></div><script>document.getElementById('out').textContent = 'rendered';</script>"
+        (Path(tmp) / "page.html").write_text(page, encoding="utf-8")
+        handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=tmp)
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/page.html"
+
+        async def scenario(pool):
+            try:
+                pages = await asyncio.gather(*(pool.render(url, timeout=10) for _ in range(5)))
+            finally:
+                await pool.close()
+            assert all("rendered" in p for p in pages)
+            assert not pool._slots and not pool._retired
+            assert pool.launched == 3  # initial browser, then one replacement per 2 pages
+
+        try:
+            asyncio.run(scenario(BrowserPool(browsers=1, max_pages=2, recycle_after=2)))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_fetcher_overlaps_requests_and_limits_per_host():
+    if not (has_module("httpx") or has_module("requests")):
+        return  # optional dependency
+    delay = 0.3
+
+    class SlowHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(2.0 if self.path == "/hang" else delay)
+            body = b"<p>ok</p>"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+
+    async def timed_batch(fetcher, n):
+        try:
+            await fetcher.fetch_text(url)  # backend import and client setup stay out of the timing
+            start = time.monotonic()
+            pages = await asyncio.gather(*(fetcher.fetch_text(url) for _ in range(n)))
+            assert pages == ["<p>ok</p>"] * n
+            assert not fetcher._hosts
+            return time.monotonic() - start
+        finally:
+            await fetcher.close()
+
+    async def times_out(fetcher):
+        try:
+            await fetcher.fetch_text(url.replace("/page", "/hang"), timeout=0.2)
+        except TimeoutError:
+            return True
+        finally:
+            await fetcher.close()
+        return False
+
+    try:
+        assert asyncio.run(timed_batch(AsyncFetcher(per_host=6), 4)) < delay * 2.5
+        assert asyncio.run(timed_batch(AsyncFetcher(per_host=1), 4)) >= delay * 4 * 0.9
+        assert asyncio.run(times_out(AsyncFetcher()))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_export_bytes_and_spill():
+    if not (has_module("fpdf") and has_module("docx") and has_module("bs4")):
+        return  # optional dependencies
+    md = "# Title\n\nSome **bold** text\n\n- one\n- two\n"
+    assert export_pdf_bytes(markdown_to_html(md)).startswith(b"%PDF")
+    assert export_docx_bytes(markdown_to_html(md)).startswith(b"PK")
+    with tempfile.TemporaryDirectory() as tmp:
+        spills = [Path(tmp) / "a.pdf", Path(tmp) / "b.docx"]
+        small = export_content_spooled(md, "md", "pdf", spills[0], 1 << 30)
+        assert small.startswith(b"%PDF") and not spills[0].exists()
+        paths = [export_content_spooled(md, "md", p.suffix[1:], p, 0) for p in spills]
+        assert paths == spills
+        assert paths[0].read_bytes().startswith(b"%PDF") and paths[1].read_bytes().startswith(b"PK")
+
+
+def test_streaming_matches_whole_document():
+    html = "<h1>T</h1><ul><li>a</li></ul><style>p{}</style><div><div>d</div></div><p>x &amp; y</p>" * 20
+    md = "# T\n\n```\ncode\n\nmore\n```\n\nSome **bold** text\n\n" * 20
+    for stream, source, whole in (
+        (HTMLToMarkdownStream(), html, html_to_markdown(html)),
+        (MarkdownToHTMLStream(), md, markdown_to_html(md)),
+    ):
+        pieces = [stream.feed(source[i:i + 7]) for i in range(0, len(source), 7)]
+        assert sum(1 for p in pieces if p) > 1  # output starts before the input ends
+        assert "".join(pieces) + stream.close() == whole
+
+
+HTML_TOKENS = [
+    "<p>", "</p>", "<div>", "</div>", "<div style=\"color:red\">", "<span>", "</span>", "\n", "\n\n", " ", "a", "x y",
+    "<h1>", "</h1>", "<ul>", "<li>", "</li>", "</ul>", "<ol>", "</ol>", "<strong>", "</strong>", "<em>", "</em>",
+    "<br>", "<style>p{}</style>", "&amp;", "&lt;", "<a href=\"x\">", "</a>", "<a title=\"a>b\">", "<pre>", "</pre>",
+    "<code>", "</code>", "<table><tr><th>h</th></tr><tr><td>", "</td></tr></table>", "<blockquote>", "</blockquote>",
+    "<img src=\"i.png\" alt=\"i\">", "<!-- c -->", "<script>if (a > b) {}</script>", "<input type=\"checkbox\">", "#", "[]",
+    "a > b", "->", ">",
+]
+
+
+def test_html_stream_matches_on_random_documents():
+    rng = random.Random(40)
+    for _ in range(500):
+        html = "".join(rng.choice(HTML_TOKENS) for _ in range(rng.randint(1, 30)))
+        whole = html_to_markdown(html)
+        for size in (1, 5, 64, len(html)):
+            stream = HTMLToMarkdownStream()
+            pieces = [stream.feed(html[i:i + size]) for i in range(0, len(html), size)]
+            assert "".join(pieces) + stream.close() == whole, (html, size)
+
+
+# no emphasis, strikethrough or code-span markers: those may run across a blank line
+MD_TOKENS = [
+    "#", "# ", "##", ">", "> ", "\n", "\n\n", "\n\n\n", "a", "b c", "[", "]", "(", ")", "](", "![", "---", "-", "1. ",
+    "```\nx\n\ny\n```\n", "```py\nz\n```", "[l](u)", "![i](p)", "\t", " ",
+]
+
+
+def test_md_stream_matches_on_random_documents():
+    rng = random.Random(40)
+    for _ in range(500):
+        md = "".join(rng.choice(MD_TOKENS) for _ in range(rng.randint(1, 30)))
+        whole = markdown_to_html(md)
+        for size in (1, 2, 7, len(md)):
+            stream = MarkdownToHTMLStream()
+            pieces = [stream.feed(md[i:i + size]) for i in range(0, len(md), size)]
+            assert "".join(pieces) + stream.close() == whole, (md, size)
+
+
+def test_bulk_items_convert_in_order():
+    items = [
+        {"id": "a", "content": "<h1>T</h1>", "type": "html"},
+        '{"id": "b", "content": "# T", "type": "md"}',
+        {"id": "c", "content": "x", "type": "pdf"},
+        "{oops",
+    ]
+    out = convert_items(items)
+    assert out[0] == {"id": "a", "result": "# T"}
+    assert out[1] == {"id": "b", "result": "<h1>T</h1>"}
+    assert out[2]["id"] == "c" and "error" in out[2]
+    assert out[3]["error"].startswith("Invalid JSON")
+
+
+def test_job_queue_runs_and_cancels():
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(3):
+            p = Path(tmp) / f"doc{i}.md"
+            p.write_text(f"# Doc {i}", encoding="utf-8")
+            files.append(str(p))
+        jobs = JobQueue(concurrency=1, max_workers=1)
+        try:
+            gate = threading.Event()
+            jobs._executor.submit(gate.wait)  # hold the only job slot
+            job = jobs.submit(files, target_format="auto")
+            queued = jobs.submit(files)
+            assert job.status == "queued" and jobs.cancel(queued.id).control.cancelled
+            gate.set()
+            deadline = time.monotonic() + 10
+            while not (job.is_finished and queued.is_finished) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert job.status == "done" and queued.status == "cancelled"
+            assert sorted(i for i, _ in job.results) == [0, 1, 2]
+            assert job.describe()["summary"]["succeeded"] == 3
+            assert (Path(tmp) / "doc2.html").read_text(encoding="utf-8") == "<h1>Doc 2</h1>"
+        finally:
+            jobs.close()
+
+
+def test_result_cache_lru_and_etags():
+    key = cache_key("<h1>T</h1>", "md", base_url=None, rewrite_paths=False)
+    assert key == cache_key("<h1>T</h1>", "md", rewrite_paths=False, base_url=None)
+    assert key != cache_key("<h1>T</h1>", "md", base_url=None, rewrite_paths=True)
+    assert etag_matches(f'W/"x", "{key}"', f'"{key}"') and not etag_matches('"x"', f'"{key}"')
+
+    cache = ResultCache(max_bytes=450)
+    for name in ("a", "b", "c"):
+        cache.put(name, name * 100)
+    assert cache.get("a") is None  # evicted to stay under the budget
+    assert cache.get("c") == "c" * 100
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["evictions"] >= 1
+    assert stats["bytes"] <= 450
+
+
+def test_metrics_middleware_and_server_timing():
+    async def convert_text(scope, receive, send):
+        scope["endpoint"] = convert_text
+        await receive()
+        with timed("convert"):
+            await asyncio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"12345"})
+
+    metrics = Metrics()
+    metrics.add_sample("pool_queue_depth", "gauge", "Queued conversions.", lambda: 3)
+    app = MetricsMiddleware(convert_text, metrics)
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"abc", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": "POST", "path": "/x"}, receive, send))
+    timing = dict(sent[0]["headers"])[b"server-timing"].decode()
+    assert timing.startswith("parse;dur=") and "convert;dur=" in timing and "serialize;dur=" in timing
+    text = metrics.render()
+    assert 'converter_http_requests_total{handler="convert_text",method="POST",status="200"} 1' in text
+    assert 'converter_http_request_duration_seconds_bucket{handler="convert_text",le="+Inf"} 1' in text
+    assert 'converter_http_request_bytes_total{handler="convert_text"} 3' in text
+    assert 'converter_http_response_bytes_total{handler="convert_text"} 5' in text
+    assert "converter_pool_queue_depth 3" in text
+
+
+def test_admission_control_sheds_load():
+    async def slow_app(scope, receive, send):
+        await receive()
+        await asyncio.sleep(0.2)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def call(app, headers=(), client="1.2.3.4", path="/api/convert/text"):
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"x", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "path": path, "headers": list(headers), "client": (client, 1)}
+        await app(scope, receive, send)
+        return sent[0]["status"], dict(sent[0]["headers"])
+
+    async def scenario():
+        control = AdmissionControl(max_concurrent=1, max_queue=1, queue_timeout=5.0, rate=1.0, burst=3)
+        app = AdmissionMiddleware(
+            slow_app, control, max_body=10, prefixes=("/api/convert",), body_limits={"/api/convert/file": 100}
+        )
+        results = await asyncio.gather(call(app), call(app), call(app))
+        assert sorted(status for status, _ in results) == [200, 200, 503]
+        assert all(b"retry-after" in headers for status, headers in results if status == 503)
+        assert (await call(app, client="5.6.7.8", headers=[(b"content-length", b"11")]))[0] == 413
+        assert app.body_limit("/api/convert/file") == 100 and app.body_limit("/api/convert/text") == 10
+        status, headers = await call(app)  # fourth request inside the burst window
+        assert status == 429 and b"retry-after" in headers
+
+    asyncio.run(scenario())
+
+
+def _shared_cache_writer(path: str, prefix: str, barrier) -> None:
+    cache = SharedCache(Path(path), max_bytes=20000, check_every=8)
+    if cache.get("k") != "shared":
+        raise SystemExit(1)
+    barrier.wait(30)
+    for i in range(100):
+        cache.put(f"{prefix}{i}", "x" * 500)
+    cache.close()
+
+
+def test_shared_cache_across_processes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite3"
+        first, second = SharedCache(path, max_bytes=20000, check_every=8), SharedCache(path, max_bytes=20000, check_every=8)
+        first.put("k", "shared")
+        assert second.get("k") == "shared" and second.get("missing") is None
+        second.put("ttl", "gone", ttl=-1)
+        assert first.get("ttl") is None
+
+        spawn = multiprocessing.get_context("spawn")
+        barrier = spawn.Barrier(3)  # everyone has read "k" before any writes evict it
+        procs = [spawn.Process(target=_shared_cache_writer, args=(str(path), prefix, barrier)) for prefix in "ab"]
+        for p in procs:
+            p.start()
+        barrier.wait(30)
+        for i in range(100):
+            first.put(f"c{i}", "x" * 500)
+        for p in procs:
+            p.join(60)
+        assert [p.exitcode for p in procs] == [0, 0]
+        first._evict()
+        stats = first.stats()
+        assert stats["bytes"] <= 20000 and stats["entries"] > 0
+        assert first.evictions > 0
+        assert first.get("k") is None  # least recently used goes first
+        assert second.get("a99") or second.get("b99") or second.get("c99")
+        first.close()
+        second.close()
+
+
+def test_live_session_patches_changed_blocks():
+    md = "# T\n\n```\ncode\n\nmore\n```\n\nSome **bold** text\n\n> q\n" * 5
+    session = LiveSession()
+    first = session.reset(md)
+    assert first["start"] == 0 and first["delete"] == 0 and session.html() == markdown_to_html(md)
+
+    at = md.index("Some", len(md) // 2)
+    patch = session.apply([{"from": at, "to": at + 4, "insert": "More"}], version=1)
+    assert patch["version"] == 2 and patch["delete"] == 1 and len(patch["blocks"]) == 1
+    assert "More <strong>bold</strong>" in patch["blocks"][0]
+    rendered = session.rendered
+    patch = session.apply([{"from": at, "to": at, "insert": "new\n\n"}], version=2)  # splits a block
+    assert patch["delete"] == 0 and patch["blocks"] == ["<p>new</p>"] and session.rendered == rendered + 1
+    assert session.html() == markdown_to_html(session.text)
+    try:
+        session.apply([], version=1)
+        assert False, "stale edit accepted"
+    except StaleVersion:
+        pass
+
+
+def test_upload_converts_in_chunks():
+    import io
+    import json
+
+    html = "<h1>T</h1><p>ü中 &amp; \"q\"</p><ul><li>a</li></ul>" * 200
+    with convert_upload(io.BytesIO(html.encode("utf-8")), "md", spool_bytes=1024, chunk_size=7) as out:
+        assert out._rolled  # result went to disk past spool_bytes
+        body = b"".join(iter_json_with_text({"filename": "a.md"}, "content", out, chunk_chars=100))
+    assert json.loads(body) == {"filename": "a.md", "content": html_to_markdown(html)}
+
+    html = "<p>a</p>\n\n<div>d</div>" * 5
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = Path(tmp) / "in.html", Path(tmp) / "out.md"
+        src.write_bytes(html.encode("utf-8"))
+        convert_upload_file(str(src), str(dst), "md", chunk_size=3)
+        assert dst.read_text(encoding="utf-8") == html_to_markdown(html)
+
+
+def test_live_session_matches_whole_render_after_edits():
+    rng = random.Random(49)
+    for _ in range(200):
+        # edits replace whole tokens, so they never leave a stray backtick behind
+        tokens = [rng.choice(MD_TOKENS) for _ in range(rng.randint(0, 20))]
+        session = LiveSession()
+        session.reset("".join(tokens))
+        for _ in range(10):
+            first = rng.randint(0, len(tokens))
+            last = rng.randint(first, min(len(tokens), first + 3))
+            new = [rng.choice(MD_TOKENS) for _ in range(rng.randint(0, 3))]
+            start = len("".join(tokens[:first]))
+            end = start + len("".join(tokens[first:last]))
+            session.apply([{"from": start, "to": end, "insert": "".join(new)}], session.version)
+            tokens[first:last] = new
+            assert session.text == "".join(tokens)
+            assert session.html() == markdown_to_html(session.text), session.text
+
+
 def main() -> int:
     tests = [
         test_html_links,
@@ -78,6 +716,33 @@ def main() -> int:
         test_md_math,
         test_nested_list,
         test_base_url_resolution,
+        test_batch_pause_blocks_dispatch,
+        test_batch_stats_on_completion,
+        test_buffered_writer_is_atomic,
+        test_batch_resume_skips_journaled_files,
+        test_batch_file_timeout_isolates_slow_file,
+        test_batch_dedupe_converts_identical_files_once,
+        test_batch_largest_first_schedule,
+        test_adaptive_workers_settle_at_knee,
+        test_results_are_compact_and_summarized,
+        test_convert_archive_in_memory,
+        test_jsonl_bulk_keeps_order,
+        test_conversion_pool_times_out_without_blocking,
+        test_browser_pool_recycles_browsers,
+        test_fetcher_overlaps_requests_and_limits_per_host,
+        test_export_bytes_and_spill,
+        test_streaming_matches_whole_document,
+        test_html_stream_matches_on_random_documents,
+        test_md_stream_matches_on_random_documents,
+        test_bulk_items_convert_in_order,
+        test_job_queue_runs_and_cancels,
+        test_result_cache_lru_and_etags,
+        test_metrics_middleware_and_server_timing,
+        test_admission_control_sheds_load,
+        test_shared_cache_across_processes,
+        test_live_session_patches_changed_blocks,
+        test_live_session_matches_whole_render_after_edits,
+        test_upload_converts_in_chunks,
     ]
     for t in tests:
         t()